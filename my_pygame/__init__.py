@@ -5,7 +5,7 @@ from .drawable import Drawable
 from .focusable import Focusable
 from .clickable import Clickable
 from .image import Image
-from .text import Text
+from .text import Text, TEXT_RENDER_CACHE, FONT_REGISTRY
 from .shape import RectangleShape, CircleShape, PolygonShape
 from .button import Button, ImageButton
 from .entry import Entry
@@ -18,11 +18,13 @@ from .clock import Clock
 from .count_down import CountDown
 from .colors import *
 from .joystick import Joystick
-from .keyboard import Keyboard
+from .keyboard import Keyboard, KeyStates
 from .loading import Loading
 from .dialog import Dialog
 from .path import set_constant_file, set_constant_directory
 from .resources import RESOURCES
-from .thread import threaded_function
+from .thread import threaded_function, pooled_function, ThreadPool, THREAD_POOL
+from .profiler import FrameProfiler, PROFILER
+from .replay import InputRecorder, InputReplayer, ReplayError, SESSION_CLOCK
 from .multiplayer import ServerSocket, ClientSocket
 from .vector import Vector2
@@ -94,7 +94,10 @@ class Button(Clickable, RectangleShape):
 
     def __set_color(self, button_state: str) -> None:
         self.color = self.__bg[self.state][button_state]
-        self.__text.color = self.__fg[self.state][button_state]
+        fg = pygame.Color(self.__fg[self.state][button_state])
+        if fg != self.__text.color:
+            self.__text.color = fg
+            self.set_dirty()
 
     def on_hover(self) -> None:
         self.__set_color("active" if self.active else "hover")
@@ -32,7 +32,7 @@ class Clickable(Focusable):
         master.bind_event(pygame.MOUSEBUTTONUP, self.event_click_up)
         master.bind_event(pygame.JOYBUTTONDOWN, self.event_click_down)
         master.bind_event(pygame.JOYBUTTONUP, self.event_click_up)
-        master.bind_mouse(self.mouse_motion)
+        master.bind_clickable(self)
 
     @property
     def master(self) -> Window:
@@ -57,6 +57,8 @@ class Clickable(Focusable):
     def state(self, value: str) -> None:
         if value not in (Clickable.NORMAL, Clickable.DISABLED):
             return
+        if value != self.__state:
+            self.set_dirty()
         self.__state = value
         self.on_change_state()
 
@@ -81,6 +83,8 @@ class Clickable(Focusable):
         status = bool(status)
         active = self.__active
         self.__active = status
+        if status != active:
+            self.set_dirty()
         if status is True:
             if not active:
                 self.focus_set()
@@ -98,6 +102,8 @@ class Clickable(Focusable):
         status = bool(status)
         hover = self.__hover
         self.__hover = status
+        if status != hover:
+            self.set_dirty()
         if status is True:
             if not hover:
                 self.play_hover_sound()
@@ -1,6 +1,6 @@
 # -*- coding: Utf-8 -*
 
-from typing import Tuple, Optional, Any, Union, Callable
+from typing import Tuple, Optional, Any, Union, Callable, List
 import pygame
 from pygame.sprite import Sprite
 from .surface import create_surface
@@ -8,6 +8,8 @@ from .vector import Vector2
 
 class Drawable(Sprite):
 
+    MASK_FROM_SURFACE = True
+
     def __init__(self, surface: Optional[pygame.Surface] = None, rotate=0, **kwargs):
         Sprite.__init__(self)
         self.__surface = self.__mask = None
@@ -20,6 +22,9 @@ class Drawable(Sprite):
         self.__animation_started = False
         self.__animation_params = dict()
         self.__animation_window_callback = None
+        self.__dirty = True
+        self.__drawn_area = None
+        self.__parents = list()
         self.image = self.resize_surface(surface, **kwargs)
         self.rotate(rotate)
 
@@ -36,10 +41,12 @@ class Drawable(Sprite):
     def fill(self, color: pygame.Color) -> None:
         self.image.fill(color)
         self.mask_update()
+        self.set_dirty()
 
     def blit(self, source, dest, area=None, special_flags=0) -> pygame.Rect:
         rect = self.image.blit(source, dest, area=area, special_flags=special_flags)
         self.mask_update()
+        self.set_dirty()
         return rect
 
     def show(self) -> None:
@@ -49,7 +56,10 @@ class Drawable(Sprite):
         self.set_visibility(False)
 
     def set_visibility(self, status: bool) -> None:
-        self.__draw_sprite = bool(status)
+        status = bool(status)
+        if status != self.__draw_sprite:
+            self.__draw_sprite = status
+            self.set_dirty()
 
     def is_shown(self) -> bool:
         return bool(self.__draw_sprite and self.__valid_size)
@@ -67,6 +77,8 @@ class Drawable(Sprite):
         self.__surface = surface
         self.__rect = self.__surface.get_rect(**self.__former_moves)
         self.mask_update()
+        self.set_dirty()
+        self.__on_move()
 
     @property
     def rect(self) -> pygame.Rect:
@@ -74,15 +86,56 @@ class Drawable(Sprite):
 
     @property
     def mask(self) -> pygame.mask.Mask:
+        if self.__mask is None:
+            if self.MASK_FROM_SURFACE:
+                self.__mask = pygame.mask.from_surface(self.__surface)
+            else:
+                self.__mask = pygame.mask.Mask(self.__surface.get_size(), fill=True)
         return self.__mask
 
     def mask_update(self) -> None:
-        self.__mask = pygame.mask.from_surface(self.__surface)
+        self.__mask = None
 
     @property
     def angle(self) -> float:
         return self.__angle
 
+    def set_dirty(self) -> None:
+        self.__dirty = True
+
+    def is_dirty(self) -> bool:
+        return self.__dirty
+
+    def get_area(self) -> pygame.Rect:
+        return self.rect.copy()
+
+    def get_drawn_rects(self) -> List[pygame.Rect]:
+        if self.__drawn_area is None:
+            return list()
+        return [self.__drawn_area]
+
+    def add_parent(self, parent) -> None:
+        if parent not in self.__parents:
+            self.__parents.append(parent)
+
+    def remove_parent(self, parent) -> None:
+        if parent in self.__parents:
+            self.__parents.remove(parent)
+
+    def __on_move(self) -> None:
+        for parent in self.__parents:
+            parent.on_child_move(self)
+
+    def get_dirty_rects(self) -> List[pygame.Rect]:
+        if not self.__dirty:
+            return list()
+        dirty_rects = self.get_drawn_rects()
+        self.__drawn_area = self.get_area() if self.is_shown() else None
+        if self.__drawn_area is not None:
+            dirty_rects.append(self.__drawn_area)
+        self.__dirty = False
+        return dirty_rects
+
     def draw(self, surface: pygame.Surface) -> None:
         if self.is_shown():
             self.before_drawing(surface)
@@ -113,12 +166,16 @@ class Drawable(Sprite):
         self.__x = self.__rect.x
         self.__y = self.__rect.y
         self.__former_moves = kwargs
+        self.set_dirty()
+        self.__on_move()
 
     def move_ip(self, x: float, y: float) -> None:
         self.__x += x
         self.__y += y
         self.__rect = self.__surface.get_rect(x=self.__x, y=self.__y)
         self.__former_moves = {"x": self.__x, "y": self.__y}
+        self.set_dirty()
+        self.__on_move()
 
     def animate_move(self, master, milliseconds: float, speed=1, after_move=None, **kwargs) -> None:
         if milliseconds <= 0 or speed <= 0:
@@ -222,6 +279,7 @@ class Drawable(Sprite):
             self.__valid_size = False
         else:
             self.__valid_size = True
+        self.set_dirty()
 
     def set_width(self, width: float, smooth=True)-> None:
         try:
@@ -230,6 +288,7 @@ class Drawable(Sprite):
             self.__valid_size = False
         else:
             self.__valid_size = True
+        self.set_dirty()
 
     def set_height(self, height: float, smooth=True) -> None:
         try:
@@ -238,6 +297,7 @@ class Drawable(Sprite):
             self.__valid_size = False
         else:
             self.__valid_size = True
+        self.set_dirty()
 
     left = property(lambda self: self.rect.left, lambda self, value: self.move(left=value))
     right = property(lambda self: self.rect.right, lambda self, value: self.move(right=value))
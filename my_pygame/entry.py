@@ -47,9 +47,11 @@ class Entry(Clickable, RectangleShape):
         if not self.edit():
             self.__show_cursor = False
             self.__cursor_animated = False
+            self.set_dirty()
         else:
             self.__show_cursor = not self.__show_cursor
             self.__cursor_animated = True
+            self.set_dirty()
             self.__cursor_animation_window_callback = self.master.after(milliseconds, lambda: self.__animate_cursor(milliseconds))
 
     @property
@@ -76,6 +78,7 @@ class Entry(Clickable, RectangleShape):
         self.master.disable_text_input()
         self.__show_cursor = False
         self.master.remove_window_callback(self.__cursor_animation_window_callback)
+        self.set_dirty()
 
     def move(self, **kwargs) -> None:
         RectangleShape.move(self, **kwargs)
@@ -87,6 +90,7 @@ class Entry(Clickable, RectangleShape):
 
     def key_press(self, event: pygame.event.Event) -> None:
         if self.edit():
+            self.set_dirty()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_BACKSPACE:
                     self.__text.message = self.__text.message[:self.cursor - 1] + self.__text.message[self.cursor:]
@@ -32,6 +32,8 @@ class Focusable:
         status = bool(status)
         focus = self.__focus
         self.__focus = status
+        if status != focus:
+            self.set_dirty()
         if status is True:
             if not focus:
                 self.on_focus_set()
@@ -17,6 +17,8 @@ class Joystick(object):
         self.__dpad_list = ["UP", "DOWN", "LEFT", "RIGHT"]
 
         self.__event_type = {key: [str(), -1, 0] for key in self.button_list + self.axis_list + self.dpad_list}
+        self.__resolved_keys = dict()
+        self.__actions = None
 
         self.__save_file = os.path.join(sys.path[0], "joystick.bin")
         if os.path.isfile(self.__save_file):
@@ -39,6 +41,7 @@ class Joystick(object):
             self.__joystick = pygame.joystick.Joystick(event.device_index)
             if self.guid in self.__save:
                 self.__event_type = self.__save[self.guid]
+                self.__clear_resolved_keys()
             else:
                 self.set_default_layout()
 
@@ -77,6 +80,11 @@ class Joystick(object):
         }
         for key, value in layout.items():
             self.__event_type[key] = list(value)
+        self.__clear_resolved_keys()
+
+    def __clear_resolved_keys(self) -> None:
+        self.__resolved_keys.clear()
+        self.__actions = None
 
     def __save_to_file(self) -> None:
         self.__save[self.guid] = dict(self.__event_type)
@@ -109,19 +117,28 @@ class Joystick(object):
             raise NameError("{} isn't recognized".format(key))
         return key, suffix
 
+    def __resolve(self, key: str) -> Tuple[str, str, int, Union[int, Tuple[int, int]]]:
+        resolved = self.__resolved_keys.get(key)
+        if resolved is None:
+            name, suffix = self.__test(key)
+            event, index, active_state = self.__event_type[name]
+            active_state = {"": active_state, "-": -1, "+": 1}[suffix]
+            resolved = self.__resolved_keys[key] = (name, event, index, active_state)
+        return resolved
+
     def get_value(self, key: str) -> float:
-        key, suffix = self.__test(key)
+        key, event, index, active_state = self.__resolve(key)
         if not self.connected():
             return 0
-        event, index, active_state = self.__event_type[key]
-        active_state = {"": active_state, "-": -1, "+": 1}[suffix]
-        actions = {
-            "button": self.__joystick.get_button,
-            "axis": self.__joystick.get_axis,
-            "hat": self.__joystick.get_hat,
-        }
         try:
-            state = actions[event](index)
+            if event == "button":
+                state = self.__joystick.get_button(index)
+            elif event == "axis":
+                state = self.__joystick.get_axis(index)
+            elif event == "hat":
+                state = self.__joystick.get_hat(index)
+            else:
+                return 0
         except pygame.error:
             return 0
         if event == "button":
@@ -147,6 +164,13 @@ class Joystick(object):
                 return key
         return None
 
+    def get_action(self, event_type: str, index: int, hat_value: Optional[Tuple[int, int]] = None) -> Union[str, None]:
+        if self.__actions is None:
+            self.__actions = dict()
+            for key, (event, idx, value) in self.__event_type.items():
+                self.__actions.setdefault((event, idx, tuple(value) if event == "hat" else None), key)
+        return self.__actions.get((event_type, index, tuple(hat_value) if event_type == "hat" else None))
+
     def __getitem__(self, key: str) -> Union[int, float]:
         key = self.__test(key)[0]
         infos = self.__event_type[key]
@@ -164,6 +188,7 @@ class Joystick(object):
         }
         if event in event_map:
             self.__event_type[key] = list(event_map[event])
+            self.__clear_resolved_keys()
             self.__save_to_file()
 
     def set_button_axis(self, state: bool) -> None:
@@ -1,8 +1,15 @@
 # -*- coding: Utf-8 -*
 
-from typing import Union, Dict
+from typing import Union, Dict, Iterable, Optional
 import pygame
 
+class KeyStates(frozenset):
+
+    __slots__ = ()
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self
+
 class Keyboard(object):
 
     __slots__ = ("__states")
@@ -10,8 +17,18 @@ class Keyboard(object):
     def __init__(self):
         self.__states = list()
 
-    def update(self) -> None:
-        self.__states = pygame.key.get_pressed()
+    def update(self, pressed_keys: Optional[Iterable[int]] = None) -> None:
+        if pressed_keys is None:
+            self.__states = pygame.key.get_pressed()
+        else:
+            self.__states = KeyStates(pressed_keys)
+
+    def get_pressed_keys(self) -> KeyStates:
+        states = pygame.key.get_pressed()
+        return KeyStates(key for key in self.key_dict if states[key])
+
+    def any_pressed(self) -> bool:
+        return any(self.__states)
 
     @property
     def key_dict(self) -> Dict[int, str]:
@@ -1,18 +1,29 @@
 # -*- coding: Utf-8 -*
 
-from typing import Sequence, Iterator, Any
+from typing import Sequence, Iterator, Any, List, Tuple
 import pygame
 from .drawable import Drawable
 from .focusable import Focusable
 from .shape import RectangleShape
 from .colors import TRANSPARENT
+from .profiler import PROFILER, draw_object
 
 class DrawableList:
+
+    SPATIAL_GRID_CELL_SIZE = 64
+
     def __init__(self, bg_color=None, draw=True):
         self.__bg_color = pygame.Color(bg_color) if bg_color is not None else TRANSPARENT
         self.__list = list()
         self.__index = -1
         self.__draw = draw
+        self.__removed_rects = list()
+        self.__drawn_area = None
+        self.__parents = list()
+        self.__focusable = None
+        self.__spatial_grid = None
+        self.__spatial_grid_objects = frozenset()
+        self.__spatial_grid_version = 0
 
     def __len__(self) -> int:
         return len(self.__list)
@@ -48,21 +59,37 @@ class DrawableList:
         for obj in [obj, *objs]:
             if isinstance(obj, (Drawable, DrawableList)) and obj not in self.__list:
                 self.__list.append(obj)
+                obj.add_parent(self)
+                self.on_child_list_change(obj)
+                self.on_child_move(obj)
 
     def remove(self, *obj_list: Drawable) -> None:
         for obj in obj_list:
             if obj in self.__list:
                 self.__list.remove(obj)
+                self.__removed_rects.extend(obj.get_drawn_rects())
+                obj.remove_parent(self)
+                self.on_child_list_change(obj)
+                self.on_child_move(obj)
         self.__update_index()
 
     def remove_from_index(self, index: int) -> None:
         if index in range(len(self.__list)):
-            self.__list.pop(index)
+            obj = self.__list.pop(index)
+            self.__removed_rects.extend(obj.get_drawn_rects())
+            obj.remove_parent(self)
+            self.on_child_list_change(obj)
+            self.on_child_move(obj)
             self.__update_index()
 
     def clear(self) -> None:
+        for obj in self.__list:
+            self.__removed_rects.extend(obj.get_drawn_rects())
+            obj.remove_parent(self)
         self.__list.clear()
         self.__index = -1
+        self.on_child_list_change(self)
+        self.on_child_move(self)
 
     def empty(self) -> bool:
         if self.__list:
@@ -75,6 +102,7 @@ class DrawableList:
         if relative_to:
             new_pos += self.__list.index(relative_to)
         self.__list.insert(new_pos, obj)
+        self.on_child_list_change(obj)
 
     def __update_index(self) -> None:
         size = len(self.focusable)
@@ -86,8 +114,15 @@ class DrawableList:
             self.before_drawing(surface)
             if self.__bg_color and self.__bg_color != TRANSPARENT:
                 pygame.draw.rect(surface, self.__bg_color, self.rect)
-            for obj in self.__list:
-                obj.draw(surface)
+            draw = PROFILER.draw_object if PROFILER.enabled else draw_object
+            clip = surface.get_clip()
+            if clip == surface.get_rect():
+                for obj in self.__list:
+                    draw(obj, surface)
+            else:
+                for obj in self.__list:
+                    if clip.colliderect(obj.get_area()):
+                        draw(obj, surface)
             self.after_drawing(surface)
 
     def before_drawing(self, surface: pygame.Surface) -> None:
@@ -100,6 +135,89 @@ class DrawableList:
         for obj in self.__list:
             obj.update(*args, **kwargs)
 
+    def add_parent(self, parent) -> None:
+        if parent not in self.__parents:
+            self.__parents.append(parent)
+
+    def remove_parent(self, parent) -> None:
+        if parent in self.__parents:
+            self.__parents.remove(parent)
+
+    def on_child_list_change(self, obj) -> None:
+        self.__focusable = None
+        for parent in self.__parents:
+            parent.on_child_list_change(self)
+
+    def on_child_move(self, obj) -> None:
+        self.__spatial_grid = None
+        for parent in self.__parents:
+            parent.on_child_move(self)
+
+    @property
+    def spatial_grid_version(self) -> int:
+        self.__update_spatial_grid()
+        return self.__spatial_grid_version
+
+    def in_spatial_grid(self, obj: Focusable) -> bool:
+        self.__update_spatial_grid()
+        return bool(obj in self.__spatial_grid_objects)
+
+    def focusable_at(self, pos: Tuple[int, int]) -> Sequence[Focusable]:
+        self.__update_spatial_grid()
+        cell_size = DrawableList.SPATIAL_GRID_CELL_SIZE
+        return self.__spatial_grid.get((int(pos[0]) // cell_size, int(pos[1]) // cell_size), tuple())
+
+    def __update_spatial_grid(self) -> None:
+        if self.__spatial_grid is not None:
+            return
+        cell_size = DrawableList.SPATIAL_GRID_CELL_SIZE
+        spatial_grid = dict()
+        spatial_grid_objects = list()
+        for obj in self.focusable:
+            if not hasattr(obj, "rect"):
+                continue
+            rect = getattr(obj, "rect")
+            spatial_grid_objects.append(obj)
+            for x in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+                for y in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+                    spatial_grid.setdefault((x, y), list()).append(obj)
+        self.__spatial_grid = spatial_grid
+        self.__spatial_grid_objects = frozenset(spatial_grid_objects)
+        self.__spatial_grid_version += 1
+
+    def set_dirty(self) -> None:
+        for obj in self.__list:
+            obj.set_dirty()
+
+    def get_area(self) -> pygame.Rect:
+        area_list = [obj.get_area() for obj in self.__list]
+        if not area_list:
+            return pygame.Rect(0, 0, 0, 0)
+        return area_list[0].unionall(area_list[1:])
+
+    def get_drawn_rects(self) -> List[pygame.Rect]:
+        drawn_rects = list()
+        if self.__drawn_area is not None:
+            drawn_rects.append(self.__drawn_area)
+        for obj in self.__list:
+            drawn_rects.extend(obj.get_drawn_rects())
+        return drawn_rects
+
+    def get_dirty_rects(self) -> List[pygame.Rect]:
+        dirty_rects = self.__removed_rects
+        self.__removed_rects = list()
+        for obj in self.__list:
+            dirty_rects.extend(obj.get_dirty_rects())
+        if self.__bg_color and self.__bg_color != TRANSPARENT:
+            area = self.rect if self.is_shown() and self.__draw else None
+            if area != self.__drawn_area:
+                if self.__drawn_area is not None:
+                    dirty_rects.append(self.__drawn_area)
+                if area is not None:
+                    dirty_rects.append(area)
+                self.__drawn_area = area
+        return dirty_rects
+
     def move(self, **kwargs) -> None:
         pass
 
@@ -182,13 +300,15 @@ class DrawableList:
 
     @property
     def focusable(self) -> Sequence[Focusable]:
-        focusable_list = list()
-        for obj in self.__list:
-            if isinstance(obj, Focusable):
-                focusable_list.append(obj)
-            elif isinstance(obj, DrawableList):
-                focusable_list.extend(obj.focusable)
-        return focusable_list
+        if self.__focusable is None:
+            focusable_list = list()
+            for obj in self.__list:
+                if isinstance(obj, Focusable):
+                    focusable_list.append(obj)
+                elif isinstance(obj, DrawableList):
+                    focusable_list.extend(obj.focusable)
+            self.__focusable = tuple(focusable_list)
+        return self.__focusable
 
     @property
     def drawable(self) -> Sequence[Drawable]:
@@ -39,7 +39,7 @@ class Loading(Window):
     
     def on_quit(self) -> None:
         if self.__thread_loading is not None:
-            self.__thread_loading.join()
+            self.__thread_loading.result()
 
     def update(self) -> None:
         if not self.__loading:
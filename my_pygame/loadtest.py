@@ -0,0 +1,148 @@
+# -*- coding: Utf-8 -*
+
+import sys
+import time
+import struct
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from .stats import percentile
+from .multiplayer import ServerSocket, STRUCT_FORMAT_PREFIX, STRUCT_FORMAT_SIZE, set_tcp_nodelay
+from .protocol import MessageCodec, MESSAGE_CODEC, HELLO_MESSAGE, JOIN_ROOM_MESSAGE, ROOM_JOINED_MESSAGE, ROOM_ERROR_MESSAGE, SESSION_MESSAGE
+
+class FakePlayer:
+
+    def __init__(self, codec: Optional[MessageCodec] = None, tcp_nodelay=True):
+        self.codec = codec if codec is not None else MESSAGE_CODEC
+        self.tcp_nodelay = tcp_nodelay
+        self.reader = None
+        self.writer = None
+        self.room = None
+        self.session = None
+
+    async def connect(self, host: str, port: int) -> None:
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        if self.tcp_nodelay:
+            set_tcp_nodelay(self.writer.get_extra_info("socket"))
+
+    async def send(self, msg: str, data: Any = None) -> None:
+        payload = self.codec.encode(msg, data)
+        self.writer.write(struct.pack(STRUCT_FORMAT_PREFIX, len(payload)) + payload)
+        await self.writer.drain()
+
+    async def recv(self) -> Tuple[str, Any]:
+        while True:
+            header = await self.reader.readexactly(STRUCT_FORMAT_SIZE)
+            payload = await self.reader.readexactly(struct.unpack(STRUCT_FORMAT_PREFIX, header)[0])
+            version, msg, data = self.codec.decode(payload)
+            if msg == SESSION_MESSAGE:
+                self.session = data
+            elif msg != HELLO_MESSAGE:
+                return (msg, data)
+
+    async def join_room(self, code=str()) -> str:
+        await self.send(JOIN_ROOM_MESSAGE, code)
+        msg, data = await self.recv()
+        if msg == ROOM_ERROR_MESSAGE:
+            raise ConnectionError(data)
+        if msg != ROOM_JOINED_MESSAGE:
+            raise ConnectionError(f"Unexpected message {msg!r} while joining a room")
+        self.room = data[0]
+        return self.room
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self.writer = self.reader = None
+
+def summarize(results: Sequence[Any], round_trips: List[float], elapsed: float) -> Dict[str, Any]:
+    errors = [result for result in results if isinstance(result, BaseException)]
+    nb_messages = sum(result for result in results if isinstance(result, int))
+    round_trips = sorted(round_trips)
+    return {
+        "failed": len(errors),
+        "messages": nb_messages,
+        "elapsed": elapsed,
+        "messages_per_second": nb_messages / elapsed if elapsed > 0 else 0,
+        "round_trip_ms": {
+            "p50": percentile(round_trips, 50) * 1000,
+            "p90": percentile(round_trips, 90) * 1000,
+            "p99": percentile(round_trips, 99) * 1000,
+            "max": round_trips[-1] * 1000 if round_trips else 0
+        },
+        "errors": sorted(set(str(error) for error in errors))
+    }
+
+async def run_concurrently(play: Callable[..., Awaitable[int]], nb_groups: int, *args: Any) -> Dict[str, Any]:
+    round_trips = list()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(play(*args, round_trips) for _ in range(nb_groups)), return_exceptions=True)
+    return summarize(results, round_trips, time.perf_counter() - start)
+
+def run_in_threads(play: Callable[..., int], nb_groups: int, *args: Any) -> Dict[str, Any]:
+    round_trips = list()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, nb_groups)) as executor:
+        futures = [executor.submit(play, *args, round_trips) for _ in range(nb_groups)]
+    results = [future.exception() or future.result() for future in futures]
+    return summarize(results, round_trips, time.perf_counter() - start)
+
+async def play_room(host: str, port: int, nb_messages: int, round_trips: List[float]) -> int:
+    first, second = FakePlayer(), FakePlayer()
+    try:
+        await first.connect(host, port)
+        await second.connect(host, port)
+        await second.join_room(await first.join_room())
+        for i in range(nb_messages):
+            start = time.perf_counter()
+            await first.send("ping", i)
+            await second.recv()
+            await second.send("pong", i)
+            await first.recv()
+            round_trips.append(time.perf_counter() - start)
+        return 2 * nb_messages
+    finally:
+        await first.close()
+        await second.close()
+
+async def run_rooms(host: str, port: int, nb_rooms: int, nb_messages: int) -> Dict[str, Any]:
+    report = await run_concurrently(play_room, nb_rooms, host, port, nb_messages)
+    report.update({"rooms": nb_rooms, "players": 2 * nb_rooms, "failed_rooms": report.pop("failed")})
+    return report
+
+def run_room_load_test(nb_rooms: int, nb_messages=20, host: Optional[str] = None, port=12800) -> Dict[str, Any]:
+    server = None
+    if host is None:
+        server = ServerSocket(max_rooms=nb_rooms)
+        server.bind(port, 128)
+        if not server.connected():
+            raise OSError(f"Cannot bind the relay server on port {port}")
+        host = "localhost"
+    try:
+        return asyncio.run(run_rooms(host, port, nb_rooms, nb_messages))
+    finally:
+        if server is not None:
+            server.stop()
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m my_pygame.loadtest", description="Open many fake players on a room relay server")
+    parser.add_argument("-r", "--rooms", type=int, default=200, help="Number of simultaneous rooms")
+    parser.add_argument("-m", "--messages", type=int, default=20, help="Ping-pong exchanges per room")
+    parser.add_argument("--host", default=None, help="Server to test (a local server is started if omitted)")
+    parser.add_argument("-p", "--port", type=int, default=12800, help="Server port")
+    args = parser.parse_args(argv)
+    report = run_room_load_test(args.rooms, args.messages, host=args.host, port=args.port)
+    print(f"Rooms: {report['rooms']} ({report['failed_rooms']} failed), players: {report['players']}")
+    print(f"Messages: {report['messages']} in {report['elapsed']:.2f}s ({report['messages_per_second']:.0f} msg/s)")
+    print("Round trip: p50 {p50:.3f}ms, p90 {p90:.3f}ms, p99 {p99:.3f}ms, max {max:.3f}ms".format(**report["round_trip_ms"]))
+    for error in report["errors"]:
+        print(f"Error: {error}")
+    return 0 if report["failed_rooms"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,22 +3,49 @@
 import socket
 import select
 import struct
-import pickle
-from typing import List, Any, Optional
+import time
+import queue
+import asyncio
+import threading
+import secrets
+import string
+import concurrent.futures
+from collections import deque
+from socket import IPPROTO_TCP, TCP_NODELAY
+from typing import List, Dict, Any, Optional, Callable, Sequence, Tuple
 from .thread import threaded_function
-from .clock import Clock
+from .protocol import MessageCodec, ProtocolError, MESSAGE_CODEC, HELLO_MESSAGE, HEADER
+from .protocol import JOIN_ROOM_MESSAGE, ROOM_JOINED_MESSAGE, ROOM_ERROR_MESSAGE, PING_MESSAGE, PONG_MESSAGE
+from .protocol import SESSION_MESSAGE, RESUME_SESSION_MESSAGE, SESSION_LOG_MESSAGE, PEER_SUSPENDED_MESSAGE, PEER_RESUMED_MESSAGE
 
 STRUCT_FORMAT_PREFIX = ">I"
 STRUCT_FORMAT_SIZE = struct.calcsize(STRUCT_FORMAT_PREFIX)
 
+def recv_exactly(socket: socket.socket, size: int) -> bytes:
+    data = bytearray(size)
+    view = memoryview(data)
+    received = 0
+    while received < size:
+        nb_bytes = socket.recv_into(view[received:])
+        if nb_bytes == 0:
+            raise ConnectionError("Connection closed")
+        received += nb_bytes
+    return bytes(data)
+
 def recv_data(socket: socket.socket) -> bytes:
     try:
-        recv_size = struct.unpack(STRUCT_FORMAT_PREFIX, socket.recv(STRUCT_FORMAT_SIZE))[0]
-        data = socket.recv(recv_size)
-    except:
+        recv_size = struct.unpack(STRUCT_FORMAT_PREFIX, recv_exactly(socket, STRUCT_FORMAT_SIZE))[0]
+        data = recv_exactly(socket, recv_size)
+    except (OSError, struct.error):
         data = None
     return data
 
+def set_tcp_nodelay(socket: socket.socket, enabled=True) -> None:
+    try:
+        socket.setsockopt(IPPROTO_TCP, TCP_NODELAY, int(bool(enabled)))
+    except (OSError, AttributeError):
+        pass
+
 def send_data(socket: socket.socket, data: bytes) -> None:
     try:
         packed_data = struct.pack(STRUCT_FORMAT_PREFIX, len(data)) + data
@@ -26,15 +53,199 @@ def send_data(socket: socket.socket, data: bytes) -> None:
     except:
         pass
 
-class ServerSocket:
+class FrameReader:
+
+    def __init__(self, bufsize=65536):
+        self.__buffer = bytearray()
+        self.__recv_buffer = bytearray(bufsize)
+        self.__recv_view = memoryview(self.__recv_buffer)
+
+    def __len__(self) -> int:
+        return len(self.__buffer)
+
+    def clear(self) -> None:
+        self.__buffer.clear()
+
+    def read(self, socket: socket.socket) -> Optional[List[bytes]]:
+        nb_bytes = socket.recv_into(self.__recv_view)
+        if nb_bytes == 0:
+            return None
+        return self.feed(self.__recv_view[:nb_bytes])
+
+    def feed(self, data: bytes) -> List[bytes]:
+        self.__buffer += data
+        frames = list()
+        offset = 0
+        buffer_size = len(self.__buffer)
+        with memoryview(self.__buffer) as view:
+            while buffer_size - offset >= STRUCT_FORMAT_SIZE:
+                frame_size = struct.unpack_from(STRUCT_FORMAT_PREFIX, view, offset)[0]
+                frame_end = offset + STRUCT_FORMAT_SIZE + frame_size
+                if frame_end > buffer_size:
+                    break
+                frames.append(bytes(view[offset + STRUCT_FORMAT_SIZE:frame_end]))
+                offset = frame_end
+        if offset > 0:
+            del self.__buffer[:offset]
+        return frames
+
+class ConnectionStats:
+
+    def __init__(self):
+        self.__start_time = time.monotonic()
+        self.last_received = self.__start_time
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.messages_received = 0
+        self.messages_sent = 0
+
+    @property
+    def duration(self) -> float:
+        return time.monotonic() - self.__start_time
+
+    @property
+    def idle_time(self) -> float:
+        return time.monotonic() - self.last_received
+
+    @property
+    def received_throughput(self) -> float:
+        duration = self.duration
+        return self.bytes_received / duration if duration > 0 else 0
+
+    @property
+    def sent_throughput(self) -> float:
+        duration = self.duration
+        return self.bytes_sent / duration if duration > 0 else 0
+
+    def add_received(self, nb_bytes: int) -> None:
+        self.bytes_received += nb_bytes
+        self.messages_received += 1
+        self.last_received = time.monotonic()
+
+    def add_sent(self, nb_bytes: int) -> None:
+        self.bytes_sent += nb_bytes
+        self.messages_sent += 1
+
+    def add(self, stats) -> None:
+        self.bytes_received += stats.bytes_received
+        self.bytes_sent += stats.bytes_sent
+        self.messages_received += stats.messages_received
+        self.messages_sent += stats.messages_sent
+
+class RelayConnection:
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, tcp_nodelay=True):
+        self.reader = reader
+        self.writer = writer
+        self.socket = writer.get_extra_info("socket")
+        if tcp_nodelay and self.socket is not None:
+            set_tcp_nodelay(self.socket)
+        self.address = writer.get_extra_info("peername")
+        self.stats = ConnectionStats()
+        self.room = None
+        self.session = None
+        self.closed = False
+
+    async def recv_frame(self) -> bytes:
+        header = await self.reader.readexactly(STRUCT_FORMAT_SIZE)
+        payload = await self.reader.readexactly(struct.unpack(STRUCT_FORMAT_PREFIX, header)[0])
+        self.stats.add_received(len(header) + len(payload))
+        return header + payload
+
+    async def send_frame(self, frame: bytes) -> None:
+        self.writer.write(frame)
+        self.stats.add_sent(len(frame))
+        await self.writer.drain()
+
+    async def close(self) -> None:
+        self.closed = True
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+class RelaySession:
+
+    __slots__ = ("token", "room", "connection", "disconnected_at")
+
+    def __init__(self, token: str, room: str, connection: RelayConnection):
+        self.token = token
+        self.room = room
+        self.connection = connection
+        self.disconnected_at = None
+
+    @property
+    def disconnected(self) -> bool:
+        return self.disconnected_at is not None
+
+class RelayEngine:
 
     def __init__(self):
+        self.__loop = None
         self.__thread = None
+        self.__lock = threading.Lock()
+
+    def running(self) -> bool:
+        return self.__loop is not None and self.__loop.is_running()
+
+    def start(self) -> None:
+        with self.__lock:
+            if self.__loop is not None:
+                return
+            self.__loop = asyncio.new_event_loop()
+            started = threading.Event()
+            self.__loop.call_soon(started.set)
+            self.__thread = self.__run()
+            started.wait()
+
+    @threaded_function
+    def __run(self) -> None:
+        asyncio.set_event_loop(self.__loop)
+        self.__loop.run_forever()
+
+    def run(self, coroutine) -> concurrent.futures.Future:
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__loop)
+
+    def stop(self) -> None:
+        with self.__lock:
+            if self.__loop is None:
+                return
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+            self.__thread.join()
+            self.__loop.close()
+            self.__loop = self.__thread = None
+
+RELAY_ENGINE = RelayEngine()
+
+class ServerSocket:
+
+    DEFAULT_ROOM = str()
+    ANY_ROOM = "*"
+    ROOM_CODE_LENGTH = 6
+    ROOM_CODE_CHARACTERS = string.ascii_uppercase + string.digits
+    MAX_LOG_SIZE = 1024
+
+    def __init__(self, engine: Optional[RelayEngine] = None, room_size=2, max_rooms=1000, codec: Optional[MessageCodec] = None, tcp_nodelay=True, idle_timeout=15, grace_period=60,
+                 max_log_size=MAX_LOG_SIZE):
+        self.__engine = engine if engine is not None else RELAY_ENGINE
+        self.__codec = codec if codec is not None else MESSAGE_CODEC
+        self.__server = None
         self.__port = -1
         self.__listen = 0
         self.__socket = None
-        self.__clients = list()
-        self.__loop = False
+        self.__connections = list()
+        self.__closed_stats = ConnectionStats()
+        self.__rooms = {ServerSocket.DEFAULT_ROOM: list()}
+        self.__sessions = dict()
+        self.__logs = dict()
+        self.room_size = room_size
+        self.max_rooms = max_rooms
+        self.tcp_nodelay = tcp_nodelay
+        self.idle_timeout = idle_timeout
+        self.grace_period = grace_period
+        self.max_log_size = max_log_size
 
     def __del__(self) -> None:
         self.stop()
@@ -44,6 +255,7 @@ class ServerSocket:
 
     def bind(self, port: int, listen: int) -> None:
         self.stop()
+        self.__closed_stats = ConnectionStats()
         try:
             self.__socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.__socket.bind(("", port))
@@ -52,7 +264,8 @@ class ServerSocket:
         else:
             self.__port = port
         self.listen = listen
-        self.__thread = self.__run()
+        if self.connected():
+            self.__server = self.__engine.run(asyncio.start_server(self.__handle_client, sock=self.__socket, backlog=self.__listen)).result()
 
     @property
     def ip(self) -> str:
@@ -74,59 +287,310 @@ class ServerSocket:
 
     @property
     def clients(self) -> List[socket.socket]:
-        return self.__clients
+        return [connection.socket for connection in self.__connections]
 
-    @threaded_function
-    def __run(self) -> None:
-        if not self.connected():
+    @property
+    def connections(self) -> List[RelayConnection]:
+        return list(self.__connections)
+
+    def get_stats(self) -> Dict[Any, ConnectionStats]:
+        return {connection.address: connection.stats for connection in self.__connections}
+
+    def get_total_stats(self) -> ConnectionStats:
+        total_stats = ConnectionStats()
+        total_stats.add(self.__closed_stats)
+        for connection in self.__connections:
+            total_stats.add(connection.stats)
+        return total_stats
+
+    @property
+    def rooms(self) -> Dict[str, int]:
+        return {code: len(room) for code, room in self.__rooms.items() if code != ServerSocket.DEFAULT_ROOM}
+
+    @property
+    def sessions(self) -> Dict[str, RelaySession]:
+        return dict(self.__sessions)
+
+    def get_room_log(self, code: str) -> List[bytes]:
+        return [frame for token, frame in self.__logs.get(code, list())]
+
+    async def __handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = RelayConnection(reader, writer, self.tcp_nodelay)
+        self.__connections.append(connection)
+        self.__enter_room(connection, ServerSocket.DEFAULT_ROOM)
+        join_room_type_id = self.__codec.get_type_id(JOIN_ROOM_MESSAGE)
+        ping_type_id = self.__codec.get_type_id(PING_MESSAGE)
+        pong_type_id = self.__codec.get_type_id(PONG_MESSAGE)
+        resume_type_id = self.__codec.get_type_id(RESUME_SESSION_MESSAGE)
+        hello_type_id = self.__codec.get_type_id(HELLO_MESSAGE)
+        quit_type_id = self.__codec.get_type_id(ClientSocket.QUIT_MESSAGE)
+        try:
+            while True:
+                frame = await asyncio.wait_for(connection.recv_frame(), self.idle_timeout)
+                type_id = frame[STRUCT_FORMAT_SIZE + 1] if len(frame) >= STRUCT_FORMAT_SIZE + HEADER.size else None
+                if type_id == join_room_type_id:
+                    await self.__join_room(connection, frame[STRUCT_FORMAT_SIZE:])
+                    continue
+                if type_id == ping_type_id:
+                    await connection.send_frame(frame[:STRUCT_FORMAT_SIZE + 1] + bytes([pong_type_id]) + frame[STRUCT_FORMAT_SIZE + HEADER.size:])
+                    continue
+                if type_id == resume_type_id:
+                    await self.__resume_session(connection, frame[STRUCT_FORMAT_SIZE:])
+                    continue
+                if connection.session is not None and type_id != hello_type_id:
+                    self.__log_frame(connection, type_id, frame)
+                for client in filter(lambda client: client is not connection and not client.closed, self.__rooms[connection.room]):
+                    try:
+                        await client.send_frame(frame)
+                    except (ConnectionError, OSError):
+                        continue
+                if type_id == quit_type_id:
+                    self.__end_session(connection)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, OSError):
+            pass
+        finally:
+            if connection.session is not None:
+                await self.__suspend_session(connection)
+            else:
+                self.__leave_room(connection)
+            if connection in self.__connections:
+                self.__connections.remove(connection)
+                self.__closed_stats.add(connection.stats)
+            await connection.close()
+
+    async def __join_room(self, connection: RelayConnection, payload: bytes) -> None:
+        try:
+            version, msg, code = self.__codec.decode(payload)
+        except ProtocolError as e:
+            await self.__send_message(connection, ROOM_ERROR_MESSAGE, str(e))
             return
-        self.__loop = True
-        while self.__loop:
-            self.__check_for_connections()
-            data_recieved = list()
-            for client in self.__clients_to_read():
-                data = recv_data(client)
-                if isinstance(data, bytes):
-                    data_recieved.append((client, data))
-            for client_who_send, data in data_recieved:
-                for client in filter(lambda client: client != client_who_send, self.clients):
-                    send_data(client, data)
-        for client in self.clients:
-            client.close()
-        self.clients.clear()
-        self.__socket.close()
-        self.__socket = None
-        self.__port = -1
+        code = code.strip().upper()
+        if code == ServerSocket.ANY_ROOM:
+            code = next((code for code, room in self.__rooms.items() if code != ServerSocket.DEFAULT_ROOM and len(room) < self.room_size), str())
+        if not code:
+            if len(self.__rooms) > self.max_rooms:
+                await self.__send_message(connection, ROOM_ERROR_MESSAGE, "Too many rooms", version)
+                return
+            code = self.__create_room_code()
+        elif code not in self.__rooms:
+            await self.__send_message(connection, ROOM_ERROR_MESSAGE, f"Room {code} does not exist", version)
+            return
+        elif connection.room != code and len(self.__rooms[code]) >= self.room_size:
+            await self.__send_message(connection, ROOM_ERROR_MESSAGE, f"Room {code} is full", version)
+            return
+        self.__end_session(connection)
+        self.__leave_room(connection)
+        self.__enter_room(connection, code)
+        await self.__send_message(connection, ROOM_JOINED_MESSAGE, (code, len(self.__rooms[code])), version)
+        await self.__send_message(connection, SESSION_MESSAGE, self.__create_session(connection).token, version)
 
-    def stop(self) -> None:
-        if self.__loop:
-            self.__loop = False
-            self.__thread.join()
-            self.__thread = None
+    def __create_session(self, connection: RelayConnection) -> RelaySession:
+        session = RelaySession(secrets.token_urlsafe(16), connection.room, connection)
+        self.__sessions[session.token] = session
+        self.__logs.setdefault(connection.room, deque(maxlen=self.max_log_size))
+        connection.session = session
+        return session
+
+    def __end_session(self, connection: RelayConnection) -> None:
+        if connection.session is not None:
+            self.__sessions.pop(connection.session.token, None)
+            connection.session = None
+
+    def __log_frame(self, connection: RelayConnection, type_id: Optional[int], frame: bytes) -> None:
+        log = self.__logs[connection.room]
+        if self.__codec.is_checkpoint(type_id):
+            log.clear()
+        log.append((connection.session.token, frame))
 
-    def __check_for_connections(self) -> None:
+    async def __suspend_session(self, connection: RelayConnection) -> None:
+        session = connection.session
+        session.disconnected_at = time.monotonic()
+        connection.closed = True
+        asyncio.get_running_loop().call_later(self.grace_period, lambda: asyncio.ensure_future(self.__expire_session(session, connection)))
+        for client in filter(lambda client: not client.closed, self.__rooms.get(connection.room, list()).copy()):
+            await self.__send_message(client, PEER_SUSPENDED_MESSAGE, float(self.grace_period))
+
+    async def __expire_session(self, session: RelaySession, connection: RelayConnection) -> None:
+        if self.__sessions.get(session.token) is not session or session.connection is not connection:
+            return
+        room = self.__rooms.get(connection.room, list())
+        self.__end_session(connection)
+        self.__leave_room(connection)
+        for client in filter(lambda client: not client.closed, room.copy()):
+            await self.__send_message(client, ClientSocket.QUIT_MESSAGE, None)
+
+    async def __resume_session(self, connection: RelayConnection, payload: bytes) -> None:
         try:
-            connections = select.select([self.__socket], [], [], 0.05)[0]
-        except:
-            connections = list()
-        self.clients.extend(connection.accept()[0] for connection in connections)
+            version, msg, token = self.__codec.decode(payload)
+        except ProtocolError as e:
+            await self.__send_message(connection, ROOM_ERROR_MESSAGE, str(e))
+            return
+        session = self.__sessions.get(token)
+        room = self.__rooms.get(session.room) if session is not None else None
+        if room is None:
+            await self.__send_message(connection, ROOM_ERROR_MESSAGE, "Session expired", version)
+            return
+        previous_connection = session.connection
+        if previous_connection is not connection:
+            previous_connection.session = None
+            self.__end_session(connection)
+            self.__leave_room(connection)
+            if previous_connection in room:
+                room[room.index(previous_connection)] = connection
+            else:
+                room.append(connection)
+            previous_connection.room = None
+            connection.room = session.room
+            connection.session = session
+            session.connection = connection
+            session.disconnected_at = None
+            if not previous_connection.closed:
+                await previous_connection.close()
+            for client in filter(lambda client: client is not connection and not client.closed, room.copy()):
+                await self.__send_message(client, PEER_RESUMED_MESSAGE, None)
+        await self.__send_message(connection, ROOM_JOINED_MESSAGE, (session.room, len(room)), version)
+        await self.__send_message(connection, SESSION_MESSAGE, token, version)
+        log = [(owner == token, frame[STRUCT_FORMAT_SIZE:]) for owner, frame in self.__logs[session.room]]
+        await self.__send_message(connection, SESSION_LOG_MESSAGE, log, version)
 
-    def __clients_to_read(self) -> List[socket.socket]:
+    async def __send_message(self, connection: RelayConnection, msg: str, data: Any, version: Optional[int] = None) -> None:
+        payload = self.__codec.encode(msg, data, version=version)
         try:
-            clients_to_read = select.select(self.clients, [], [], 0.05)[0]
-        except:
-            clients_to_read = list()
-        return clients_to_read
+            await connection.send_frame(struct.pack(STRUCT_FORMAT_PREFIX, len(payload)) + payload)
+        except (ConnectionError, OSError):
+            pass
+
+    def __create_room_code(self) -> str:
+        while True:
+            code = "".join(secrets.choice(ServerSocket.ROOM_CODE_CHARACTERS) for _ in range(ServerSocket.ROOM_CODE_LENGTH))
+            if code not in self.__rooms:
+                return code
+
+    def __enter_room(self, connection: RelayConnection, code: str) -> None:
+        self.__rooms.setdefault(code, list()).append(connection)
+        connection.room = code
+
+    def __leave_room(self, connection: RelayConnection) -> None:
+        room = self.__rooms.get(connection.room)
+        if room is not None and connection in room:
+            room.remove(connection)
+            if not room and connection.room != ServerSocket.DEFAULT_ROOM:
+                self.__rooms.pop(connection.room)
+                self.__logs.pop(connection.room, None)
+        connection.room = None
+
+    async def __close(self) -> None:
+        self.__server.close()
+        for connection in self.__connections.copy():
+            await connection.close()
+        for connection in self.__connections:
+            self.__closed_stats.add(connection.stats)
+        self.__connections.clear()
+        self.__rooms = {ServerSocket.DEFAULT_ROOM: list()}
+        self.__sessions.clear()
+        self.__logs.clear()
+        await self.__server.wait_closed()
+
+    def stop(self) -> None:
+        if self.__server is not None:
+            self.__engine.run(self.__close()).result()
+            self.__server = None
+        if self.__socket is not None:
+            self.__socket.close()
+            self.__socket = None
+        self.__port = -1
 
 class ClientSocket:
 
     QUIT_MESSAGE = "quit"
+    OUTGOING_BUFFER_SIZE = 16384
+    HEARTBEAT_INTERVAL = 1
+    HEARTBEAT_TIMEOUT = 10
+    RTT_ALPHA = 0.125
+    RTT_BETA = 0.25
+    WAIT_POLL_INTERVAL = 0.05
 
-    def __init__(self):
-        self.__thread = None
+    def __init__(self, codec: Optional[MessageCodec] = None, batch_send=False, tcp_nodelay=False, outgoing_buffer_size=OUTGOING_BUFFER_SIZE,
+                 heartbeat_interval=HEARTBEAT_INTERVAL, heartbeat_timeout=HEARTBEAT_TIMEOUT):
+        self.__reader = None
         self.__socket = None
         self.__loop = False
         self.__msg = dict()
+        self.__codec = codec if codec is not None else MESSAGE_CODEC
+        self.__protocol_version = self.__codec.min_version
+        self.__peer_version = None
+        self.__send_lock = threading.Lock()
+        self.__outgoing = bytearray()
+        self.batch_send = batch_send
+        self.tcp_nodelay = tcp_nodelay
+        self.outgoing_buffer_size = outgoing_buffer_size
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.__last_received = 0
+        self.__last_heartbeat = 0
+        self.__rtt = None
+        self.__rtt_ewma = None
+        self.__rtt_jitter = None
+        self.__server_address = None
+        self.__session = None
+        self.__connection_lost = False
+        self.__peer_suspended = False
+        self.__peer_resume_deadline = 0
+        self.__queue = queue.Queue()
+        self.__message_notifier = None
+        self.__room = None
+
+    @property
+    def codec(self) -> MessageCodec:
+        return self.__codec
+
+    @property
+    def protocol_version(self) -> int:
+        return self.__protocol_version
+
+    @property
+    def peer_version(self) -> Optional[int]:
+        return self.__peer_version
+
+    @property
+    def room(self) -> Optional[str]:
+        return self.__room
+
+    @property
+    def session(self) -> Optional[str]:
+        return self.__session
+
+    @property
+    def connection_lost(self) -> bool:
+        return self.__connection_lost
+
+    @property
+    def peer_suspended(self) -> bool:
+        return self.__peer_suspended
+
+    @property
+    def rtt(self) -> Optional[float]:
+        return self.__rtt
+
+    @property
+    def rtt_ewma(self) -> Optional[float]:
+        return self.__rtt_ewma
+
+    @property
+    def rtt_jitter(self) -> Optional[float]:
+        return self.__rtt_jitter
+
+    @property
+    def idle_time(self) -> float:
+        return time.monotonic() - self.__last_received if self.connected() else 0
+
+    @property
+    def message_notifier(self) -> Optional[Callable[[], Any]]:
+        return self.__message_notifier
+
+    @message_notifier.setter
+    def message_notifier(self, notifier: Optional[Callable[[], Any]]) -> None:
+        self.__message_notifier = notifier if callable(notifier) else None
 
     def __del__(self) -> None:
         self.stop()
@@ -143,7 +607,23 @@ class ClientSocket:
             self.__socket.settimeout(None)
         except:
             self.__socket = None
-        self.__thread = self.__run()
+        else:
+            if self.tcp_nodelay:
+                set_tcp_nodelay(self.__socket)
+        with self.__send_lock:
+            self.__outgoing.clear()
+        self.__protocol_version = self.__codec.min_version
+        self.__peer_version = None
+        self.__room = None
+        self.__session = None
+        self.__connection_lost = False
+        self.__peer_suspended = False
+        self.__server_address = (server_address, server_port) if self.connected() else None
+        self.__rtt = self.__rtt_ewma = self.__rtt_jitter = None
+        self.__last_received = self.__last_heartbeat = time.monotonic()
+        if self.connected():
+            self.__send_frame(self.__codec.hello())
+        self.__reader = self.__run()
         return self.connected()
 
     @threaded_function
@@ -151,7 +631,15 @@ class ClientSocket:
         if not self.connected():
             return
         self.__loop = True
+        frame_reader = FrameReader()
         while self.__loop:
+            self.__heartbeat()
+            if self.heartbeat_timeout and time.monotonic() - self.__last_received > self.heartbeat_timeout:
+                print("Connection timed out")
+                self.__connection_lost = True
+                self.__put_message(ClientSocket.QUIT_MESSAGE, None)
+                self.__loop = False
+                break
             try:
                 read_socket = bool(len(select.select([self.__socket], [], [], 0.05)[0]) > 0)
             except:
@@ -159,43 +647,229 @@ class ClientSocket:
             if not read_socket:
                 continue
             try:
-                data = recv_data(self.__socket)
-                msg = pickle.loads(data) if isinstance(data, bytes) else None
-            except:
-                msg = None
-            if not isinstance(msg, dict):
+                frames = frame_reader.read(self.__socket)
+            except OSError:
+                frames = None
+            if frames is None:
+                self.__connection_lost = True
+                self.__put_message(ClientSocket.QUIT_MESSAGE, None)
+                self.__loop = False
+                break
+            self.__last_received = time.monotonic()
+            for data in frames:
+                try:
+                    version, msg, data = self.__codec.decode(data)
+                except ProtocolError as e:
+                    print(f"Invalid message dropped: {e}")
+                    continue
+                if msg == HELLO_MESSAGE:
+                    self.__on_hello(*data)
+                    continue
+                if msg == PONG_MESSAGE:
+                    self.__on_pong(data)
+                    continue
+                if msg == PING_MESSAGE:
+                    continue
+                if msg == SESSION_MESSAGE:
+                    self.__session = data
+                    continue
+                if msg == ROOM_JOINED_MESSAGE:
+                    self.__on_room_joined(*data)
+                elif msg == PEER_SUSPENDED_MESSAGE:
+                    self.__peer_suspended = True
+                    self.__peer_resume_deadline = time.monotonic() + data
+                elif msg in (PEER_RESUMED_MESSAGE, ClientSocket.QUIT_MESSAGE):
+                    self.__peer_suspended = False
+                print(f"Recieved {({msg: data})}")
+                self.__put_message(msg, data)
+        with self.__send_lock:
+            self.__socket.close()
+            self.__socket = None
+
+    def __on_hello(self, peer_version: int, peer_min_version: int) -> None:
+        already_negotiated = self.__peer_version is not None
+        self.__peer_version = peer_version
+        version = self.__codec.negotiate(peer_version, peer_min_version)
+        if version is None:
+            print(f"Incompatible protocol version {peer_version} (supported: {self.__codec.min_version} to {self.__codec.version})")
+            self.__put_message(ClientSocket.QUIT_MESSAGE, None)
+            return
+        self.__protocol_version = version
+        if not already_negotiated:
+            self.__send_frame(self.__codec.hello())
+
+    def __heartbeat(self) -> None:
+        now = time.monotonic()
+        if not self.heartbeat_interval or now - self.__last_heartbeat < self.heartbeat_interval:
+            return
+        self.__last_heartbeat = now
+        self.__send_frame(self.__codec.encode(PING_MESSAGE, now, version=self.__protocol_version))
+
+    def __on_pong(self, timestamp: float) -> None:
+        rtt = time.monotonic() - timestamp
+        if rtt < 0:
+            return
+        self.__rtt = rtt
+        if self.__rtt_ewma is None:
+            self.__rtt_ewma = rtt
+            self.__rtt_jitter = rtt / 2
+        else:
+            self.__rtt_jitter = (1 - ClientSocket.RTT_BETA) * self.__rtt_jitter + ClientSocket.RTT_BETA * abs(self.__rtt_ewma - rtt)
+            self.__rtt_ewma = (1 - ClientSocket.RTT_ALPHA) * self.__rtt_ewma + ClientSocket.RTT_ALPHA * rtt
+
+    def __on_room_joined(self, code: str, nb_players: int) -> None:
+        self.__room = code
+        self.__protocol_version = self.__codec.min_version
+        self.__peer_version = None
+        self.__send_frame(self.__codec.hello())
+
+    def create_room(self, timeout=5) -> Optional[str]:
+        return self.join_room(str(), timeout=timeout)
+
+    def join_room(self, code: str, timeout=5) -> Optional[str]:
+        if not self.connected():
+            return None
+        self.__drain()
+        self.__msg.pop(ROOM_JOINED_MESSAGE, None)
+        self.__msg.pop(ROOM_ERROR_MESSAGE, None)
+        self.__send_frame(self.__codec.encode(JOIN_ROOM_MESSAGE, code, version=self.__protocol_version))
+        msg = self.__wait(ROOM_JOINED_MESSAGE, ROOM_ERROR_MESSAGE, timeout=timeout)
+        if msg == ROOM_JOINED_MESSAGE:
+            return self.__msg.pop(ROOM_JOINED_MESSAGE)[0]
+        if msg == ROOM_ERROR_MESSAGE:
+            print(f"Cannot join room: {self.__msg.pop(ROOM_ERROR_MESSAGE)}")
+        return None
+
+    def resume_session(self, timeout=5) -> Optional[List[Tuple[bool, str, Any]]]:
+        session, server_address = self.__session, self.__server_address
+        if session is None or server_address is None or self.__loop:
+            return None
+        if not self.connect(*server_address, timeout):
+            self.__session, self.__server_address, self.__connection_lost = session, server_address, True
+            return None
+        self.__session = session
+        self.__drain()
+        self.__msg.pop(ClientSocket.QUIT_MESSAGE, None)
+        self.__msg.pop(SESSION_LOG_MESSAGE, None)
+        self.__msg.pop(ROOM_ERROR_MESSAGE, None)
+        self.__send_frame(self.__codec.encode(RESUME_SESSION_MESSAGE, session, version=self.__protocol_version))
+        msg = self.__wait(SESSION_LOG_MESSAGE, ROOM_ERROR_MESSAGE, timeout=timeout)
+        self.__msg.pop(ROOM_JOINED_MESSAGE, None)
+        if msg != SESSION_LOG_MESSAGE:
+            if msg == ROOM_ERROR_MESSAGE:
+                print(f"Cannot resume session: {self.__msg.pop(ROOM_ERROR_MESSAGE)}")
+                self.__session = None
+            return None
+        log = list()
+        for own, payload in self.__msg.pop(SESSION_LOG_MESSAGE):
+            try:
+                version, msg, data = self.__codec.decode(payload)
+            except ProtocolError:
                 continue
-            print(f"Recieved {msg}")
-            self.__msg.update(msg)
-        self.__socket.close()
-        self.__socket = None
+            log.append((own, msg, data))
+        return log
+
+    def __put_message(self, msg: str, data: Any) -> None:
+        self.__queue.put((msg, data))
+        if self.__message_notifier is not None:
+            self.__message_notifier()
+
+    def __drain(self) -> None:
+        while True:
+            try:
+                msg, data = self.__queue.get_nowait()
+            except queue.Empty:
+                break
+            self.__msg[msg] = data
+
+    def dispatch(self, handlers: Dict[str, Sequence[Callable[..., Any]]]) -> None:
+        for msg in filter(lambda msg: msg in handlers, list(self.__msg)):
+            try:
+                data = self.__msg.pop(msg)
+            except KeyError:
+                continue
+            for callback in handlers[msg]:
+                callback(data)
+        while True:
+            try:
+                msg, data = self.__queue.get_nowait()
+            except queue.Empty:
+                break
+            if msg not in handlers:
+                self.__msg[msg] = data
+                continue
+            for callback in handlers[msg]:
+                callback(data)
+
+    def __send_frame(self, data: bytes, flush=True) -> None:
+        with self.__send_lock:
+            self.__outgoing += struct.pack(STRUCT_FORMAT_PREFIX, len(data))
+            self.__outgoing += data
+            if flush or len(self.__outgoing) >= self.outgoing_buffer_size:
+                self.__flush()
+
+    def __flush(self) -> None:
+        client_socket = self.__socket
+        if self.__outgoing and client_socket is not None:
+            try:
+                client_socket.sendall(self.__outgoing)
+            except OSError:
+                pass
+        self.__outgoing.clear()
+
+    def flush(self) -> None:
+        with self.__send_lock:
+            self.__flush()
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self.__outgoing)
 
     def stop(self) -> None:
         if self.__loop:
             self.send(ClientSocket.QUIT_MESSAGE)
+            self.flush()
+            self.__session = None
             self.__loop = False
-            self.__thread.join()
+            self.__reader.join()
 
     def send(self, msg: str, data: Optional[Any] = None) -> None:
         if self.connected():
-            data_dict = {str(msg): data}
-            print(f"Sending {data_dict}")
-            send_data(self.__socket, pickle.dumps(data_dict))
+            print(f"Sending {({str(msg): data})}")
+            self.__send_frame(self.__codec.encode(str(msg), data, version=self.__protocol_version), flush=not self.batch_send)
 
     def recv(self, msg: str, pop=False) -> bool:
+        self.__drain()
         recieved = bool(msg in self.__msg)
         if pop and recieved:
-            self.__msg.pop(msg)
+            self.__msg.pop(msg, None)
         return recieved
 
     def get(self, msg: str) -> Any:
+        self.__drain()
         return self.__msg.pop(msg, None)
 
-    def wait_for(self, *messages: str, timeout=1) -> str:
-        clock = Clock()
-        while self.connected() and not self.recv(ClientSocket.QUIT_MESSAGE, pop=True) and not clock.elapsed_time(timeout * 1000):
+    def __wait(self, *messages: str, timeout=1) -> Optional[str]:
+        deadline = time.monotonic() + timeout
+        self.flush()
+        self.__drain()
+        while self.connected() and not self.recv(ClientSocket.QUIT_MESSAGE, pop=True):
             for msg in messages:
-                if self.recv(msg):
+                if msg in self.__msg:
                     return msg
-        send_data(self.__socket, pickle.dumps({ClientSocket.QUIT_MESSAGE, None}))
-        return ClientSocket.QUIT_MESSAGE
\ No newline at end of file
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if not self.__peer_suspended or deadline >= self.__peer_resume_deadline:
+                    break
+                # The server keeps the peer's seat until its grace period ends, then sends a quit message
+                deadline = self.__peer_resume_deadline
+                continue
+            try:
+                msg, data = self.__queue.get(timeout=min(remaining, ClientSocket.WAIT_POLL_INTERVAL))
+            except queue.Empty:
+                continue
+            self.__msg[msg] = data
+        return None
+
+    def wait_for(self, *messages: str, timeout=1) -> Optional[str]:
+        return self.__wait(*messages, timeout=timeout)
\ No newline at end of file
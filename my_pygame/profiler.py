@@ -0,0 +1,185 @@
+# -*- coding: Utf-8 -*
+
+import csv
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Tuple
+import pygame
+from .text import Text
+from .colors import WHITE, GREEN, YELLOW, RED
+
+def draw_object(obj, surface: pygame.Surface) -> None:
+    obj.draw(surface)
+
+class ProfilerSection:
+
+    __slots__ = ("__profiler", "__name", "__start")
+
+    def __init__(self, profiler, name: str):
+        self.__profiler = profiler
+        self.__name = name
+        self.__start = 0
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.__profiler.add_time(self.__name, time.perf_counter() - self.__start)
+
+class NullSection:
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+NULL_SECTION = NullSection()
+
+class FrameProfiler:
+
+    SECTIONS = ("callbacks", "update", "draw_screen", "refresh", "event_handler")
+    OVERLAY_SIZE = (320, 180)
+    OVERLAY_GRAPH_HEIGHT = 70
+    OVERLAY_TEXT_REFRESH = 0.5
+
+    def __init__(self, max_frames=600):
+        self.__enabled = False
+        self.__frames = deque(maxlen=max_frames)
+        self.__nb_frames = 0
+        self.__current = None
+        self.__frame_start = 0
+        self.__draw_costs = dict()
+        self.__listeners = list()
+        self.__overlay_shown = False
+        self.__overlay_rect = pygame.Rect((0, 0), FrameProfiler.OVERLAY_SIZE)
+        self.__overlay_text = None
+        self.__overlay_text_time = 0
+        self.budget = 1 / 60
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    def enable(self) -> None:
+        self.__enabled = True
+
+    def disable(self) -> None:
+        self.__enabled = False
+        self.__current = None
+
+    def reset(self) -> None:
+        self.__frames.clear()
+        self.__nb_frames = 0
+        self.__current = None
+        self.__draw_costs.clear()
+
+    def add_listener(self, callback: Callable[[Dict[str, float]], Any]) -> None:
+        self.__listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, float]], Any]) -> None:
+        if callback in self.__listeners:
+            self.__listeners.remove(callback)
+
+    def start_frame(self) -> None:
+        if not self.__enabled:
+            return
+        now = time.perf_counter()
+        if self.__current is not None:
+            record = {"frame": self.__nb_frames, "frame_time": now - self.__frame_start}
+            record.update(self.__current)
+            self.__frames.append(record)
+            self.__nb_frames += 1
+            for callback in self.__listeners:
+                callback(record)
+        self.__current = dict.fromkeys(FrameProfiler.SECTIONS, 0.0)
+        self.__frame_start = now
+
+    def section(self, name: str):
+        if self.__current is None:
+            return NULL_SECTION
+        return ProfilerSection(self, name)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        if self.__current is not None:
+            self.__current[name] = self.__current.get(name, 0) + seconds
+
+    def draw_object(self, obj, surface: pygame.Surface) -> None:
+        start = time.perf_counter()
+        obj.draw(surface)
+        cost = time.perf_counter() - start
+        name = type(obj).__name__
+        total, count = self.__draw_costs.get(name, (0, 0))
+        self.__draw_costs[name] = (total + cost, count + 1)
+
+    @property
+    def frames(self) -> List[Dict[str, float]]:
+        return list(self.__frames)
+
+    def get_summary(self) -> Dict[str, Dict[str, float]]:
+        summary = dict()
+        if not self.__frames:
+            return summary
+        for name in ("frame_time",) + FrameProfiler.SECTIONS:
+            values = [frame.get(name, 0) for frame in self.__frames]
+            summary[name] = {"mean": sum(values) / len(values), "max": max(values)}
+        return summary
+
+    def get_draw_costs(self) -> List[Tuple[str, float, int]]:
+        return sorted(((name, total, count) for name, (total, count) in self.__draw_costs.items()), key=lambda cost: cost[1], reverse=True)
+
+    def dump_csv(self, filepath: str) -> None:
+        with open(filepath, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(("frame", "frame_time") + FrameProfiler.SECTIONS)
+            for frame in self.__frames:
+                writer.writerow([frame["frame"], frame["frame_time"]] + [frame.get(name, 0) for name in FrameProfiler.SECTIONS])
+
+    def dump_draw_costs_csv(self, filepath: str) -> None:
+        with open(filepath, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(("object", "total_time", "calls", "mean_time"))
+            for name, total, count in self.get_draw_costs():
+                writer.writerow((name, total, count, total / count if count else 0))
+
+    @property
+    def overlay_shown(self) -> bool:
+        return self.__overlay_shown
+
+    def show_overlay(self, status: bool) -> None:
+        self.__overlay_shown = bool(status)
+
+    @property
+    def overlay_rect(self) -> pygame.Rect:
+        return self.__overlay_rect
+
+    def draw_overlay(self, surface: pygame.Surface) -> None:
+        rect = self.__overlay_rect
+        rect.topright = surface.get_rect().topright
+        overlay = pygame.Surface(rect.size, flags=pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        graph_height = FrameProfiler.OVERLAY_GRAPH_HEIGHT
+        scale = graph_height / (2 * self.budget)
+        frames = list(self.__frames)[-rect.width:]
+        for x, frame in enumerate(frames, start=rect.width - len(frames)):
+            frame_time = frame["frame_time"]
+            color = GREEN if frame_time <= self.budget else YELLOW if frame_time <= 2 * self.budget else RED
+            pygame.draw.line(overlay, color, (x, rect.height), (x, rect.height - min(graph_height, int(frame_time * scale))))
+        pygame.draw.line(overlay, WHITE, (0, rect.height - int(self.budget * scale)), (rect.width, rect.height - int(self.budget * scale)))
+        surface.blit(overlay, rect)
+        if self.__overlay_text is None:
+            self.__overlay_text = Text(font=(None, 18), color=WHITE)
+        now = time.perf_counter()
+        if now - self.__overlay_text_time >= FrameProfiler.OVERLAY_TEXT_REFRESH:
+            self.__overlay_text_time = now
+            self.__overlay_text.message = "\n".join(
+                "{name}: {mean:.2f}ms (max {max:.2f}ms)".format(name=name, mean=1000 * values["mean"], max=1000 * values["max"])
+                for name, values in self.get_summary().items()
+            ) or "No frame recorded"
+        self.__overlay_text.move(left=rect.left + 5, top=rect.top + 5)
+        self.__overlay_text.draw(surface)
+
+PROFILER = FrameProfiler()
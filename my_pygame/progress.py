@@ -12,6 +12,8 @@ class ProgressBar(RectangleShape):
     S_LEFT = "left"
     S_RIGHT = "right"
     S_INSIDE = "inside"
+    VALUE_SIDES = (S_TOP, S_BOTTOM, S_LEFT, S_RIGHT, S_INSIDE)
+    LABEL_SIDES = (S_TOP, S_BOTTOM, S_LEFT, S_RIGHT)
 
     def __init__(self, width: int, height: int, color: pygame.Color, scale_color: pygame.Color, outline=2, from_=0, to=1, default=None, **kwargs):
         RectangleShape.__init__(self, width, height, TRANSPARENT, outline=outline, **kwargs)
@@ -43,52 +45,60 @@ class ProgressBar(RectangleShape):
 
     def after_drawing(self, surface: pygame.Surface) -> None:
         RectangleShape.after_drawing(self, surface)
+        self.__place_texts()
+        if self.__value_text.is_shown() and self.__value_text_side in ProgressBar.VALUE_SIDES:
+            self.__value_text.draw(surface)
+        if self.__label_text.is_shown() and self.__label_text_side in ProgressBar.LABEL_SIDES:
+            self.__label_text.draw(surface)
+
+    def get_area(self) -> pygame.Rect:
+        area = RectangleShape.get_area(self)
+        self.__place_texts()
+        if self.__value_text.is_shown() and self.__value_text_side in ProgressBar.VALUE_SIDES:
+            area.union_ip(self.__value_text.get_area())
+        if self.__label_text.is_shown() and self.__label_text_side in ProgressBar.LABEL_SIDES:
+            area.union_ip(self.__label_text.get_area())
+        return area
+
+    def __place_texts(self) -> None:
         offset = 10
-        if self.__value_text.is_shown():
-            movements = {
-                ProgressBar.S_TOP:    {"bottom": self.top - offset, "centerx": self.centerx},
-                ProgressBar.S_BOTTOM: {"top": self.bottom + offset, "centerx": self.centerx},
-                ProgressBar.S_LEFT:   {"right": self.left - offset, "centery": self.centery},
-                ProgressBar.S_RIGHT:  {"left": self.right + offset, "centery": self.centery},
-                ProgressBar.S_INSIDE: {"center": self.center}
-            }
-            side = self.__value_text_side
+        movements = {
+            ProgressBar.S_TOP:    {"bottom": self.top - offset, "centerx": self.centerx},
+            ProgressBar.S_BOTTOM: {"top": self.bottom + offset, "centerx": self.centerx},
+            ProgressBar.S_LEFT:   {"right": self.left - offset, "centery": self.centery},
+            ProgressBar.S_RIGHT:  {"left": self.right + offset, "centery": self.centery},
+            ProgressBar.S_INSIDE: {"center": self.center}
+        }
+        if self.__value_text.is_shown() and self.__value_text_side in ProgressBar.VALUE_SIDES:
             round_n = self.__value_text_round_n
-            if side in movements:
-                self.__value_text.message = round(self.value, round_n) if round_n > 0 else round(self.value)
-                self.__value_text.move(**movements[side])
-                self.__value_text.draw(surface)
-        if self.__label_text.is_shown():
-            movements = {
-                ProgressBar.S_TOP:    {"bottom": self.top - offset, "centerx": self.centerx},
-                ProgressBar.S_BOTTOM: {"top": self.bottom + offset, "centerx": self.centerx},
-                ProgressBar.S_LEFT:   {"right": self.left - offset, "centery": self.centery},
-                ProgressBar.S_RIGHT:  {"left": self.right + offset, "centery": self.centery},
-            }
-            side = self.__label_text_side
-            if side in movements:
-                self.__label_text.move(**movements[side])
-                self.__label_text.draw(surface)
+            self.__value_text.message = round(self.value, round_n) if round_n > 0 else round(self.value)
+            self.__value_text.move(**movements[self.__value_text_side])
+        if self.__label_text.is_shown() and self.__label_text_side in ProgressBar.LABEL_SIDES:
+            self.__label_text.move(**movements[self.__label_text_side])
 
     def show_value(self, side: str, round_n=0, **kwargs):
         self.__value_text.config(**kwargs)
         self.__value_text_side = side
         self.__value_text_round_n = int(round_n)
         self.__value_text.show()
+        self.set_dirty()
 
     def hide_value(self):
         self.__value_text.hide()
         self.__value_text_side = str()
         self.__value_text_round_n = 0
+        self.set_dirty()
 
     def show_label(self, label: str, side: str, **kwargs):
         self.__label_text.config(message=label, **kwargs)
         self.__label_text_side = side
         self.__label_text.show()
+        self.set_dirty()
 
     def hide_label(self):
         self.__label_text.hide()
         self.__label_text_side = str()
+        self.set_dirty()
 
     @property
     def color(self) -> pygame.Color:
@@ -105,6 +115,7 @@ class ProgressBar(RectangleShape):
     @bg_color.setter
     def bg_color(self, value: pygame.Color) -> None:
         self.__bg_rect.color = value
+        self.set_dirty()
 
     @property
     def scale_color(self) -> pygame.Color:
@@ -113,6 +124,7 @@ class ProgressBar(RectangleShape):
     @scale_color.setter
     def scale_color(self, value: pygame.Color) -> None:
         self.__scale_rect.color = value
+        self.set_dirty()
 
     @property
     def percent(self) -> float:
@@ -126,6 +138,7 @@ class ProgressBar(RectangleShape):
             value = 0
         self.__percent = value
         self.__value = self.__start + (self.__percent * self.__end)
+        self.set_dirty()
 
     @property
     def value(self) -> float:
@@ -139,6 +152,7 @@ class ProgressBar(RectangleShape):
             value = self.__start
         self.__value = value
         self.__percent = (self.__value - self.__start) / (self.__end - self.__start)
+        self.set_dirty()
 
     @property
     def start(self) -> float:
@@ -0,0 +1,171 @@
+# -*- coding: Utf-8 -*
+
+import json
+import struct
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+PROTOCOL_VERSION = 1
+PROTOCOL_MIN_VERSION = 1
+
+HEADER = struct.Struct(">BB")
+HELLO = struct.Struct(">BB")
+COUNT = struct.Struct(">B")
+TIMESTAMP = struct.Struct(">d")
+LOG_SIZE = struct.Struct(">I")
+LOG_ENTRY = struct.Struct(">?I")
+
+HELLO_MESSAGE = "__hello__"
+GENERIC_MESSAGE = "__generic__"
+JOIN_ROOM_MESSAGE = "__join_room__"
+ROOM_JOINED_MESSAGE = "__room_joined__"
+ROOM_ERROR_MESSAGE = "__room_error__"
+PING_MESSAGE = "__ping__"
+PONG_MESSAGE = "__pong__"
+SESSION_MESSAGE = "__session__"
+RESUME_SESSION_MESSAGE = "__resume_session__"
+SESSION_LOG_MESSAGE = "__session_log__"
+PEER_SUSPENDED_MESSAGE = "__peer_suspended__"
+PEER_RESUMED_MESSAGE = "__peer_resumed__"
+
+class ProtocolError(Exception):
+    pass
+
+def encode_nothing(data: Any) -> bytes:
+    return bytes()
+
+def decode_nothing(body: bytes) -> Any:
+    return None
+
+def encode_generic(message: Tuple[str, Any]) -> bytes:
+    name = message[0].encode("utf-8")
+    return bytes([len(name)]) + name + json.dumps(message[1]).encode("utf-8")
+
+def decode_generic(body: bytes) -> Tuple[str, Any]:
+    name_size = body[0]
+    return (bytes(body[1:1 + name_size]).decode("utf-8"), json.loads(bytes(body[1 + name_size:]).decode("utf-8")))
+
+def encode_string(string: str) -> bytes:
+    return str(string).encode("utf-8")
+
+def decode_string(body: bytes) -> str:
+    return bytes(body).decode("utf-8")
+
+def encode_room(room: Tuple[str, int]) -> bytes:
+    return COUNT.pack(room[1]) + encode_string(room[0])
+
+def decode_room(body: bytes) -> Tuple[str, int]:
+    return (decode_string(body[COUNT.size:]), COUNT.unpack_from(body)[0])
+
+def encode_timestamp(timestamp: float) -> bytes:
+    return TIMESTAMP.pack(timestamp)
+
+def decode_timestamp(body: bytes) -> float:
+    return TIMESTAMP.unpack(body)[0]
+
+def encode_session_log(entries: Sequence[Tuple[bool, bytes]]) -> bytes:
+    data = bytearray(LOG_SIZE.pack(len(entries)))
+    for own, payload in entries:
+        data += LOG_ENTRY.pack(own, len(payload))
+        data += payload
+    return bytes(data)
+
+def decode_session_log(body: bytes) -> List[Tuple[bool, bytes]]:
+    entries = list()
+    offset = LOG_SIZE.size
+    for _ in range(LOG_SIZE.unpack_from(body)[0]):
+        own, size = LOG_ENTRY.unpack_from(body, offset)
+        offset += LOG_ENTRY.size
+        if offset + size > len(body):
+            raise ValueError("Truncated session log")
+        entries.append((own, bytes(body[offset:offset + size])))
+        offset += size
+    return entries
+
+class MessageType:
+
+    __slots__ = ("name", "type_id", "encoder", "decoder", "checkpoint")
+
+    def __init__(self, name: str, type_id: int, encoder: Callable[[Any], bytes], decoder: Callable[[bytes], Any], checkpoint=False):
+        self.name = name
+        self.type_id = type_id
+        self.encoder = encoder
+        self.decoder = decoder
+        self.checkpoint = checkpoint
+
+class MessageCodec:
+
+    def __init__(self, version=PROTOCOL_VERSION, min_version=PROTOCOL_MIN_VERSION):
+        self.version = version
+        self.min_version = min_version
+        self.__types_by_name = dict()
+        self.__types_by_id = dict()
+        self.register(HELLO_MESSAGE, 0, lambda versions: HELLO.pack(*versions), HELLO.unpack)
+        self.register(GENERIC_MESSAGE, 1, encode_generic, decode_generic)
+
+    def register(self, name: str, type_id: int, encoder: Optional[Callable[[Any], bytes]] = None, decoder: Optional[Callable[[bytes], Any]] = None, checkpoint=False) -> None:
+        if not 0 <= type_id <= 255:
+            raise ValueError(f"Message type id must be in range [0, 255], got {type_id}")
+        registered = self.__types_by_id.get(type_id)
+        if registered is not None and registered.name != name:
+            raise ValueError(f"Message type id {type_id} already used by {registered.name!r}")
+        message_type = MessageType(name, type_id, encoder or encode_nothing, decoder or decode_nothing, bool(checkpoint))
+        self.__types_by_name[name] = message_type
+        self.__types_by_id[type_id] = message_type
+
+    def registered(self, name: str) -> bool:
+        return name in self.__types_by_name
+
+    def get_type_id(self, name: str) -> int:
+        return self.__types_by_name[name].type_id
+
+    def is_checkpoint(self, type_id: Optional[int]) -> bool:
+        message_type = self.__types_by_id.get(type_id)
+        return message_type is not None and message_type.checkpoint
+
+    def encode(self, msg: str, data: Any = None, version: Optional[int] = None) -> bytes:
+        version = self.version if version is None else version
+        message_type = self.__types_by_name.get(msg)
+        if message_type is None:
+            message_type = self.__types_by_name[GENERIC_MESSAGE]
+            data = (msg, data)
+        return HEADER.pack(version, message_type.type_id) + message_type.encoder(data)
+
+    def decode(self, payload: bytes) -> Tuple[int, str, Any]:
+        try:
+            version, type_id = HEADER.unpack_from(payload)
+        except struct.error:
+            raise ProtocolError("Truncated message header") from None
+        if not self.min_version <= version <= self.version:
+            raise ProtocolError(f"Unsupported protocol version {version}")
+        message_type = self.__types_by_id.get(type_id)
+        if message_type is None:
+            raise ProtocolError(f"Unknown message type {type_id}")
+        try:
+            data = message_type.decoder(memoryview(payload)[HEADER.size:])
+        except (struct.error, ValueError, IndexError, UnicodeDecodeError) as e:
+            raise ProtocolError(f"Invalid {message_type.name!r} message: {e}") from None
+        if message_type.name == GENERIC_MESSAGE:
+            return (version, *data)
+        return (version, message_type.name, data)
+
+    def hello(self) -> bytes:
+        return self.encode(HELLO_MESSAGE, (self.version, self.min_version), version=self.min_version)
+
+    def negotiate(self, peer_version: int, peer_min_version: int) -> Optional[int]:
+        version = min(self.version, peer_version)
+        if version < max(self.min_version, peer_min_version):
+            return None
+        return version
+
+MESSAGE_CODEC = MessageCodec()
+MESSAGE_CODEC.register("quit", 2)
+MESSAGE_CODEC.register(JOIN_ROOM_MESSAGE, 3, encode_string, decode_string)
+MESSAGE_CODEC.register(ROOM_JOINED_MESSAGE, 4, encode_room, decode_room)
+MESSAGE_CODEC.register(ROOM_ERROR_MESSAGE, 5, encode_string, decode_string)
+MESSAGE_CODEC.register(PING_MESSAGE, 6, encode_timestamp, decode_timestamp)
+MESSAGE_CODEC.register(PONG_MESSAGE, 7, encode_timestamp, decode_timestamp)
+MESSAGE_CODEC.register(SESSION_MESSAGE, 8, encode_string, decode_string)
+MESSAGE_CODEC.register(RESUME_SESSION_MESSAGE, 9, encode_string, decode_string)
+MESSAGE_CODEC.register(SESSION_LOG_MESSAGE, 10, encode_session_log, decode_session_log)
+MESSAGE_CODEC.register(PEER_SUSPENDED_MESSAGE, 11, encode_timestamp, decode_timestamp)
+MESSAGE_CODEC.register(PEER_RESUMED_MESSAGE, 12)
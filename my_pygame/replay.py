@@ -0,0 +1,233 @@
+# -*- coding: Utf-8 -*
+
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import struct
+import argparse
+import importlib
+from typing import Any, List, Optional, Sequence, Tuple
+import pygame
+from .keyboard import KeyStates
+
+LOG_MAGIC = b"MPIR"
+LOG_VERSION = 1
+SEED_LIMIT = 1 << 63
+
+HEADER = struct.Struct(">4sBQd")
+ENTRY = struct.Struct(">B")
+FRAME = struct.Struct(">d")
+KEY_COUNT = struct.Struct(">B")
+KEY = struct.Struct(">I")
+INPUT = struct.Struct(">hhH")
+EVENT = struct.Struct(">HH")
+
+FRAME_ENTRY = 0
+KEYS_ENTRY = 1
+INPUT_ENTRY = 2
+
+class ReplayError(Exception):
+    pass
+
+class SessionClock:
+
+    __slots__ = ("__frame_time",)
+
+    def __init__(self):
+        self.__frame_time = None
+
+    def time(self) -> float:
+        return self.__frame_time if self.__frame_time is not None else time.monotonic()
+
+    def frozen(self) -> bool:
+        return self.__frame_time is not None
+
+    def freeze(self, frame_time: float) -> None:
+        self.__frame_time = frame_time
+
+    def release(self) -> None:
+        self.__frame_time = None
+
+SESSION_CLOCK = SessionClock()
+
+def encode_event(event: pygame.event.Event) -> bytes:
+    attributes = {name: value for name, value in event.dict.items() if isinstance(value, (bool, int, float, str, tuple, list, type(None)))}
+    return json.dumps(attributes, separators=(",", ":")).encode("utf-8")
+
+def decode_event(event_type: int, body: bytes) -> pygame.event.Event:
+    attributes = {name: tuple(value) if isinstance(value, list) else value for name, value in json.loads(body.decode("utf-8")).items()}
+    return pygame.event.Event(event_type, attributes)
+
+class InputRecorder:
+
+    def __init__(self, filepath: str, seed: Optional[int] = None):
+        self.filepath = filepath
+        self.seed = int(seed) % SEED_LIMIT if seed is not None else random.SystemRandom().randrange(SEED_LIMIT)
+        self.start_time = time.monotonic()
+        self.nb_frames = 0
+        self.__pressed_keys = KeyStates()
+        self.__file = gzip.open(filepath, "wb")
+        self.__file.write(HEADER.pack(LOG_MAGIC, LOG_VERSION, self.seed, self.start_time))
+        random.seed(self.seed)
+        SESSION_CLOCK.freeze(self.start_time)
+
+    @property
+    def closed(self) -> bool:
+        return self.__file is None
+
+    def record_frame(self, pressed_keys: KeyStates) -> KeyStates:
+        frame_time = time.monotonic()
+        if self.__file is not None:
+            if pressed_keys != self.__pressed_keys:
+                self.__file.write(ENTRY.pack(KEYS_ENTRY) + KEY_COUNT.pack(len(pressed_keys)) + b"".join(KEY.pack(key) for key in pressed_keys))
+                self.__pressed_keys = pressed_keys
+            self.__file.write(ENTRY.pack(FRAME_ENTRY) + FRAME.pack(frame_time))
+            self.nb_frames += 1
+        SESSION_CLOCK.freeze(frame_time)
+        return pressed_keys
+
+    def record_input(self, mouse_pos: Tuple[int, int], events: List[pygame.event.Event]) -> None:
+        if self.__file is None:
+            return
+        data = bytearray(ENTRY.pack(INPUT_ENTRY) + INPUT.pack(*mouse_pos, len(events)))
+        for event in events:
+            body = encode_event(event)
+            data += EVENT.pack(event.type, len(body))
+            data += body
+        self.__file.write(data)
+
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+            SESSION_CLOCK.release()
+
+class InputReplayer:
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.nb_frames = 0
+        self.__finished = False
+        self.__pressed_keys = KeyStates()
+        self.__mouse_pos = (0, 0)
+        self.__file = gzip.open(filepath, "rb")
+        try:
+            magic, version, self.seed, self.start_time = HEADER.unpack(self.__read(HEADER.size))
+        except (ReplayError, OSError, EOFError):
+            self.__file.close()
+            self.__file = None
+            raise ReplayError(f"{filepath!r} is not an input log") from None
+        if magic != LOG_MAGIC:
+            self.close()
+            raise ReplayError(f"{filepath!r} is not an input log")
+        if version != LOG_VERSION:
+            self.close()
+            raise ReplayError(f"Unsupported input log version {version}")
+        random.seed(self.seed)
+        SESSION_CLOCK.freeze(self.start_time)
+
+    @property
+    def finished(self) -> bool:
+        return self.__finished
+
+    def __read(self, size: int) -> bytes:
+        data = self.__file.read(size) if self.__file is not None else bytes()
+        if len(data) != size:
+            raise ReplayError("Truncated input log")
+        return data
+
+    def __read_entry(self) -> Optional[int]:
+        entry = self.__file.read(ENTRY.size) if self.__file is not None else bytes()
+        if not entry:
+            self.__finished = True
+            return None
+        return ENTRY.unpack(entry)[0]
+
+    def next_frame(self) -> Optional[KeyStates]:
+        entry = self.__read_entry()
+        while entry == KEYS_ENTRY:
+            nb_keys = KEY_COUNT.unpack(self.__read(KEY_COUNT.size))[0]
+            self.__pressed_keys = KeyStates(key for key, in KEY.iter_unpack(self.__read(nb_keys * KEY.size)))
+            entry = self.__read_entry()
+        if entry is None:
+            return None
+        if entry != FRAME_ENTRY:
+            raise ReplayError(f"Replay out of sync at frame {self.nb_frames}: expected a frame, got entry {entry}")
+        SESSION_CLOCK.freeze(FRAME.unpack(self.__read(FRAME.size))[0])
+        self.nb_frames += 1
+        return self.__pressed_keys
+
+    def next_input(self) -> Tuple[Tuple[int, int], List[pygame.event.Event]]:
+        entry = self.__read_entry()
+        if entry is None:
+            return (self.__mouse_pos, list())
+        if entry != INPUT_ENTRY:
+            raise ReplayError(f"Replay out of sync at frame {self.nb_frames}: expected input, got entry {entry}")
+        x, y, nb_events = INPUT.unpack(self.__read(INPUT.size))
+        self.__mouse_pos = (x, y)
+        events = list()
+        for _ in range(nb_events):
+            event_type, size = EVENT.unpack(self.__read(EVENT.size))
+            events.append(decode_event(event_type, self.__read(size)))
+        return (self.__mouse_pos, events)
+
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__finished = self.__finished or not self.__file.peek(1)
+            self.__file.close()
+            self.__file = None
+            SESSION_CLOCK.release()
+
+def load_window_class(path: str) -> Any:
+    module_name, _, class_name = path.partition(":")
+    if not class_name:
+        raise ValueError(f"Window must be given as 'module:ClassName', got {path!r}")
+    return getattr(importlib.import_module(module_name), class_name)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    # Window imports this module, so it can only be imported once the package is loaded
+    from .window import Window
+    from .profiler import PROFILER
+    parser = argparse.ArgumentParser(prog="python -m my_pygame.replay", description="Record a Window session input log or replay it faster than real time")
+    parser.add_argument("mode", choices=("record", "play"), help="Record a new session or replay a recorded one")
+    parser.add_argument("file", help="Input log file")
+    parser.add_argument("window", help="Window class to open, as 'module:ClassName' (e.g. navy:NavyWindow)")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Random seed of a recorded session (random if omitted)")
+    parser.add_argument("--headless", action="store_true", help="Replay without opening a window or an audio device")
+    parser.add_argument("--profile", default=None, help="Save the frame times of the replay to this CSV file")
+    args = parser.parse_args(argv)
+    if args.mode == "play" and args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    window_class = load_window_class(args.window)
+    if args.mode == "record":
+        recorder = Window.start_recording(args.file, args.seed)
+        print(f"Recording to {args.file} with seed {recorder.seed}")
+        session = recorder
+    else:
+        session = Window.start_replay(args.file)
+        if args.profile:
+            Window.enable_profiler(overlay=False)
+    start = time.perf_counter()
+    try:
+        window_class().mainloop()
+    except SystemExit:
+        pass
+    finally:
+        Window.stop_recording()
+        Window.stop_replay()
+    elapsed = time.perf_counter() - start
+    print(f"{session.nb_frames} frames in {elapsed:.2f}s ({session.nb_frames / elapsed if elapsed > 0 else 0:.0f} frames/s)")
+    if args.mode == "play":
+        if args.profile:
+            PROFILER.dump_csv(args.profile)
+        if not session.finished:
+            print("The session stopped before the end of the input log", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,7 @@
 import os
 import pygame
 from typing import Tuple, Union, Dict, List, Any, Iterator
-from .thread import threaded_function
+from .thread import pooled_function
 
 def find_in_iterable(iterable, *key_before, valid_callback=None) -> Iterator[Tuple[Union[int, str], ...]]:
     if isinstance(iterable, dict):
@@ -79,7 +79,7 @@ class Resources:
                 container[key] = resources_loader(container[key])
                 self.__loaded += 1
 
-    @threaded_function
+    @pooled_function
     def threaded_load(self) -> None:
         self.load()
 
@@ -10,6 +10,7 @@ class Shape(Drawable):
 
     def __init__(self, color: pygame.Color, outline: int, outline_color: pygame.Color, **kwargs):
         Drawable.__init__(self, surface=None, size=None, width=None, height=None, min_width=None, min_height=None, max_width=None, max_height=None, smooth=False, **kwargs)
+        self.__color = self.__outline_color = None
         self.color = color
         self.outline = outline
         self.outline_color = outline_color
@@ -20,7 +21,10 @@ class Shape(Drawable):
 
     @color.setter
     def color(self, value: pygame.Color) -> None:
-        self.__color = pygame.Color(value) if value is not None else TRANSPARENT
+        color = pygame.Color(value) if value is not None else TRANSPARENT
+        if self.__color != color:
+            self.__color = color
+            self.set_dirty()
 
     @property
     def outline(self) -> int:
@@ -31,6 +35,7 @@ class Shape(Drawable):
         self.__outline = int(value)
         if self.__outline < 0:
             self.__outline = 0
+        self.set_dirty()
 
     @property
     def outline_color(self) -> pygame.Color:
@@ -38,7 +43,10 @@ class Shape(Drawable):
 
     @outline_color.setter
     def outline_color(self, value: pygame.Color) -> None:
-        self.__outline_color = pygame.Color(value) if value is not None else TRANSPARENT
+        outline_color = pygame.Color(value) if value is not None else TRANSPARENT
+        if self.__outline_color != outline_color:
+            self.__outline_color = outline_color
+            self.set_dirty()
 
 class PolygonShape(Shape):
 
@@ -78,6 +86,9 @@ class PolygonShape(Shape):
     def focus_drawing_function(self, surface: pygame.Surface, highlight_color: pygame.Color, highlight_thickness: int) -> None:
         pygame.draw.polygon(surface, highlight_color, self.points, width=highlight_thickness)
 
+    def get_area(self) -> pygame.Rect:
+        return self.rect.inflate(2 * self.outline + 2, 2 * self.outline + 2)
+
     def move(self, **kwargs) -> None:
         Shape.move(self, **kwargs)
         if not self.__from_property:
@@ -131,6 +142,7 @@ class RectangleShape(Shape):
     def config(self, **kwargs) -> None:
         for key, value in filter(lambda key, value: key in self.__draw_params, kwargs.items()):
             self.__draw_params[key] = int(value)
+        self.set_dirty()
 
     border_radius = property(
         lambda self: self.__draw_params["border_radius"],
@@ -193,6 +205,7 @@ class CircleShape(Shape):
     def config(self, **kwargs) -> None:
         for key, value in filter(lambda key, value: key in self.__draw_params, kwargs.items()):
             self.__draw_params[key] = bool(value)
+        self.set_dirty()
 
     draw_top_left = property(
         lambda self: self.__draw_params["draw_top_left"],
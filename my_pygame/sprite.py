@@ -1,6 +1,7 @@
 # -*- coding: Utf-8 -*
 
 import itertools
+import weakref
 from typing import List, Union, Dict
 import pygame
 from .surface import create_surface
@@ -10,6 +11,8 @@ from .clock import Clock
 
 class Sprite(Drawable):
 
+    __animated_sprites = weakref.WeakSet()
+
     def __init__(self):
         Drawable.__init__(self)
         self.__sprites = dict()
@@ -99,7 +102,12 @@ class Sprite(Drawable):
             self.__sprite_idx = (self.__sprite_idx + 1) % self.__nb_sprites
             self.image = self.__sprite_list[self.__sprite_idx]
             if self.__sprite_idx == 0 and not self.__loop:
-                self.__animation = False
+                self.stop_animation()
+
+    def get_dirty_rects(self) -> List[pygame.Rect]:
+        if self.animated():
+            self.set_dirty()
+        return Drawable.get_dirty_rects(self)
 
     def start_animation(self, loop=False) -> None:
         self.__loop = bool(loop)
@@ -109,6 +117,12 @@ class Sprite(Drawable):
     def restart_animation(self) -> None:
         self.__animation = True
         self.__clock.tick()
+        Sprite.__animated_sprites.add(self)
 
     def stop_animation(self) -> None:
-        self.__animation = False
\ No newline at end of file
+        self.__animation = False
+        Sprite.__animated_sprites.discard(self)
+
+    @staticmethod
+    def animation_running() -> bool:
+        return any(sprite.animated() for sprite in Sprite.__animated_sprites)
\ No newline at end of file
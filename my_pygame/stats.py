@@ -0,0 +1,9 @@
+# -*- coding: Utf-8 -*
+
+from typing import Sequence
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    if not values:
+        return 0
+    index = min(int(round(percent / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
@@ -1,6 +1,7 @@
 # -*- coding: Utf-8 -*
 
 import os.path
+from collections import OrderedDict
 from typing import Tuple
 import pygame
 from pygame.font import Font, SysFont
@@ -9,12 +10,104 @@ from .drawable import Drawable
 from .image import Image
 from .colors import BLACK
 
+class TextRenderCache(object):
+
+    __slots__ = ("__cache", "__maxsize", "__hits", "__misses")
+
+    def __init__(self, maxsize=512):
+        self.__cache = OrderedDict()
+        self.__maxsize = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.maxsize = maxsize
+
+    def __len__(self) -> int:
+        return len(self.__cache)
+
+    @property
+    def maxsize(self) -> int:
+        return self.__maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int) -> None:
+        self.__maxsize = max(int(value), 0)
+        while len(self.__cache) > self.__maxsize:
+            self.__cache.popitem(last=False)
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    def render(self, font: Font, line: str, color: pygame.Color, antialias=True) -> pygame.Surface:
+        color = pygame.Color(color)
+        key = (font, font.get_bold(), font.get_italic(), font.get_underline(), line, tuple(color), bool(antialias))
+        render = self.__cache.get(key)
+        if render is not None:
+            self.__cache.move_to_end(key)
+            self.__hits += 1
+            return render
+        self.__misses += 1
+        render = font.render(line, antialias, color)
+        if self.__maxsize > 0:
+            self.__cache[key] = render
+            if len(self.__cache) > self.__maxsize:
+                self.__cache.popitem(last=False)
+        return render
+
+    def clear(self) -> None:
+        self.__cache.clear()
+        self.__hits = self.__misses = 0
+
+TEXT_RENDER_CACHE = TextRenderCache()
+
+class FontRegistry(object):
+
+    __slots__ = ("__fonts", "__system_fonts_loaded")
+
+    def __init__(self):
+        self.__fonts = dict()
+        self.__system_fonts_loaded = False
+
+    def __len__(self) -> int:
+        return len(self.__fonts)
+
+    def load_system_fonts(self) -> None:
+        if not self.__system_fonts_loaded:
+            pygame.font.get_fonts()
+            self.__system_fonts_loaded = True
+
+    def get(self, name: str, size: int, bold=False, italic=False, underline=False) -> Font:
+        key = (name, size, bool(bold), bool(italic), bool(underline))
+        font = self.__fonts.get(key)
+        if font is None:
+            if name is not None and os.path.isfile(name):
+                font = Font(name, size)
+                font.set_bold(bool(bold))
+                font.set_italic(bool(italic))
+            else:
+                self.load_system_fonts()
+                font = SysFont(name, size, bold=bool(bold), italic=bool(italic))
+            font.set_underline(bool(underline))
+            self.__fonts[key] = font
+        return font
+
+    def clear(self) -> None:
+        self.__fonts.clear()
+
+FONT_REGISTRY = FontRegistry()
+
 class Text(Drawable):
 
     T_LEFT = "left"
     T_RIGHT = "right"
     T_CENTER = "center"
 
+    MASK_FROM_SURFACE = False
+
     def __init__(self, message=str(), font=None, color=BLACK,
                  justify="left", shadow=False, shadow_x=0, shadow_y=0, shadow_color=BLACK,
                  img=None, compound="left", **kwargs):
@@ -97,29 +190,22 @@ class Text(Drawable):
         self.__shadow_color = pygame.Color(color)
         if self.__shadow_surface:
             self.__shadow_surface.color = color
+            self.set_dirty()
 
     @staticmethod
     def create_font_object(font) -> Font:
         obj = None
         if isinstance(font, (tuple, list)):
-            if font[0] is not None and os.path.isfile(font[0]):
-                obj = Font(*font[0:2])
-                if "bold" in font:
-                    obj.set_bold(True)
-                if "italic" in font:
-                    obj.set_italic(True)
-            else:
-                obj = SysFont(*font[0:2], bold=bool("bold" in font), italic=bool("italic" in font))
-            if "underline" in font:
-                obj.set_underline(True)
+            obj = FONT_REGISTRY.get(*font[0:2], bold="bold" in font, italic="italic" in font, underline="underline" in font)
         elif isinstance(font, Font):
             obj = font
         else:
-            obj = SysFont(pygame.font.get_default_font(), 15)
+            obj = FONT_REGISTRY.get(pygame.font.get_default_font(), 15)
         return obj
 
     def config(self, **kwargs) -> None:
         config_for_shadow = dict()
+        former_config = (self.__str, self.__font, self.__color, self.__justify, self.__img, self.__compound)
         if "message" in kwargs:
             config_for_shadow["message"] = self.__str = str(kwargs["message"])
         if "font" in kwargs:
@@ -139,10 +225,17 @@ class Text(Drawable):
             self.__shadow = kwargs["shadow"]
             if self.__shadow_surface:
                 self.__shadow_surface.set_visibility(any(value != 0 for value in self.__shadow[0:2]))
-        self.__update_surface()
+        if "img" in kwargs or former_config != (self.__str, self.__font, self.__color, self.__justify, self.__img, self.__compound):
+            self.__update_surface()
         if self.__shadow_surface:
             self.__shadow_surface.config(**config_for_shadow)
 
+    def get_area(self) -> pygame.Rect:
+        area = Drawable.get_area(self)
+        if self.__shadow_surface and self.__shadow_surface.is_shown():
+            area.union_ip(self.__shadow_surface.image.get_rect(x=self.x + self.shadow[0], y=self.y + self.shadow[1]))
+        return area
+
     def before_drawing(self, surface: pygame.Surface) -> None:
         if self.__shadow_surface and self.__shadow_surface.is_shown():
             self.__shadow_surface.move(x=self.x + self.shadow[0], y=self.y + self.shadow[1])
@@ -161,7 +254,7 @@ class Text(Drawable):
         size = [0, 0]
         for index, line in enumerate(self.message.splitlines()):
             font = self.__custom_font.get(index, self.font)
-            render = font.render(line, True, self.color)
+            render = TEXT_RENDER_CACHE.render(font, line, self.color)
             size[0] = max(size[0], render.get_width())
             size[1] += render.get_height()
             render_lines.append(render)
@@ -1,7 +1,11 @@
 # -*- coding: Utf-8 -*
 
+import sys
+import threading
+import traceback
 from threading import Thread
 from functools import wraps
+from concurrent.futures import Future, ThreadPoolExecutor
 
 def threaded_function(function):
 
@@ -10,5 +14,62 @@ def threaded_function(function):
         thread = Thread(target=function, args=args, kwargs=kwargs, daemon=True)
         thread.start()
         return thread
-    
-    return wrapper
\ No newline at end of file
+
+    return wrapper
+
+class ThreadPool:
+
+    DEFAULT_MAX_WORKERS = 4
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, report_errors=True):
+        self.__executor = None
+        self.__max_workers = max(1, int(max_workers))
+        self.__lock = threading.Lock()
+        self.report_errors = report_errors
+
+    @property
+    def max_workers(self) -> int:
+        return self.__max_workers
+
+    @max_workers.setter
+    def max_workers(self, value: int) -> None:
+        with self.__lock:
+            self.__max_workers = max(1, int(value))
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False)
+                self.__executor = None
+
+    def running(self) -> bool:
+        return self.__executor is not None
+
+    def submit(self, function, *args, **kwargs) -> Future:
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix="my_pygame")
+            future = self.__executor.submit(function, *args, **kwargs)
+        if self.report_errors:
+            future.add_done_callback(self.__report_error)
+        return future
+
+    @staticmethod
+    def __report_error(future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            error = future.exception()
+            print("Exception in pooled function:", file=sys.stderr)
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+    def shutdown(self, wait=True) -> None:
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+THREAD_POOL = ThreadPool()
+
+def pooled_function(function):
+
+    @wraps(function)
+    def wrapper(*args, **kwargs) -> Future:
+        return THREAD_POOL.submit(function, *args, **kwargs)
+
+    return wrapper
@@ -2,32 +2,50 @@
 
 import os
 import sys
+import time
+import heapq
+import itertools
 import configparser
-from typing import Callable, Any, Union, Optional, Type, Sequence, Tuple
+from typing import Callable, Any, Union, Optional, Type, Sequence, Tuple, List
 import pygame
 from .drawable import Drawable
 from .focusable import Focusable
-from .text import Text
+from .text import Text, FONT_REGISTRY
 from .shape import RectangleShape
 from .progress import ProgressBar
 from .list import DrawableList
+from .sprite import Sprite
 from .joystick import Joystick, JoystickList
-from .keyboard import Keyboard
-from .clock import Clock
+from .keyboard import Keyboard, KeyStates
 from .colors import BLACK, WHITE, BLUE, TRANSPARENT
 from .resources import RESOURCES
 from .multiplayer import ServerSocket, ClientSocket
+from .thread import THREAD_POOL
+from .profiler import PROFILER, FrameProfiler
+from .replay import SESSION_CLOCK, InputRecorder, InputReplayer
 
 CONFIG_FILE = os.path.join(sys.path[0], "window.conf")
 
 class WindowCallback(object):
+
+    __slots__ = ("wait_time", "callback", "deadline", "cancelled", "__order")
+    __counter = itertools.count()
+
     def __init__(self, callback: Callable[..., Any], wait_time: float):
         self.wait_time = wait_time
         self.callback = callback
-        self.clock = Clock()
+        self.deadline = SESSION_CLOCK.time() + wait_time / 1000
+        self.cancelled = False
+        self.__order = next(WindowCallback.__counter)
+
+    def __lt__(self, other) -> bool:
+        return (self.deadline, self.__order) < (other.deadline, other.__order)
 
     def can_call(self) -> bool:
-        return self.clock.elapsed_time(self.wait_time, restart=False)
+        return not self.cancelled and SESSION_CLOCK.time() >= self.deadline
+
+    def cancel(self) -> None:
+        self.cancelled = True
 
     def __call__(self):
         return self.callback()
@@ -38,8 +56,12 @@ class Window(object):
     MIXER_SIZE = -16
     MIXER_CHANNELS = 2
     MIXER_BUFFER = 512
+    MAX_DIRTY_RECTS = 32
+    MESSAGE_RECEIVED_EVENT = pygame.event.custom_type()
+    JOYSTICK_EVENTS = (pygame.JOYBUTTONDOWN, pygame.JOYAXISMOTION, pygame.JOYHATMOTION)
 
     __main_window = None
+    __last_drawn_window = None
     __default_key_repeat = (0, 0)
     __text_input_enabled = False
     __all_opened = list()
@@ -51,13 +73,19 @@ class Window(object):
     __actual_music = None
     __show_fps = False
     __fps = 60
+    __adaptive_pacing = False
+    __idle_delay = 0.5
+    __max_idle_sleep = 1
     __fps_obj = None
     __joystick = JoystickList()
     __all_window_event_handler_dict = dict()
+    __all_window_bindings_version = 0
     __keyboard = Keyboard()
+    __recorder = None
+    __replayer = None
     __all_window_key_enabled = True
     __server_socket = ServerSocket()
-    __client_socket = ClientSocket()
+    __client_socket = ClientSocket(batch_send=True, tcp_nodelay=True)
 
     def __init__(self, master=None, size=(0, 0), flags=0, bg_color=BLACK, bg_music=None, nb_joystick=0, loading=None, config=True):
         if not isinstance(Window.__main_window, Window):
@@ -69,12 +97,29 @@ class Window(object):
         self.__show_fps_in_this_window = True
         self.__objects = DrawableList()
         self.__event_handler_dict = dict()
+        self.__message_handler_dict = dict()
         self.__key_handler_dict = dict()
         self.__key_state_dict = dict()
         self.__joystick_handler_dict = dict()
         self.__joystick_state_dict = dict()
         self.__mouse_handler_list = list()
+        self.__bindings_version = 0
+        self.__compiled_bindings_version = None
+        self.__event_dispatch_table = dict()
+        self.__key_state_table = tuple()
+        self.__joystick_state_table = tuple()
+        self.__clickable_list = list()
+        self.__clickable_set = set()
+        self.__clickable_out_of_grid = list()
+        self.__clickable_out_of_grid_version = -1
+        self.__mouse_targets = list()
         self.__callback_after = list()
+        self.__last_activity_time = 0
+        self.__idle = False
+        self.__waited_event = None
+        self.__dirty_rects_enabled = False
+        self.__redraw_all = True
+        self.__master_scene = None
         self.rect_to_update = None
         self.bg_color = bg_color
         self.bg_music = bg_music
@@ -91,6 +136,7 @@ class Window(object):
         self.__key_enabled = True
         self.__screenshot = False
         self.bind_key(pygame.K_F11, lambda event: self.screenshot())
+        self.bind_key(pygame.K_F3, lambda event: Window.toggle_profiler())
         if not Window.__fps_obj:
             Window.__fps_obj = Text(color=BLUE)
 
@@ -101,9 +147,11 @@ class Window(object):
             if status[1] > 0:
                 print("Error on pygame initialization ({} modules failed to load)".format(status[1]), file=sys.stderr)
                 sys.exit(1)
+            FONT_REGISTRY.load_system_fonts()
             Window.__use_config = bool(config)
             Window.load_config()
             Window.__joystick.set(nb_joystick)
+            Window.__client_socket.message_notifier = Window.__notify_message_received
             Window.bind_event_all_window(pygame.JOYDEVICEADDED, Window.__joystick.event_connect)
             Window.bind_event_all_window(pygame.CONTROLLERDEVICEADDED, Window.__joystick.event_connect)
             Window.bind_event_all_window(pygame.JOYDEVICEREMOVED, Window.__joystick.event_disconnect)
@@ -191,6 +239,7 @@ class Window(object):
     @bg_color.setter
     def bg_color(self, color: pygame.Color) -> None:
         self.__bg_color = pygame.Color(color) if color is not None else TRANSPARENT
+        self.__redraw_all = True
 
     @property
     def loop(self) -> bool:
@@ -199,21 +248,36 @@ class Window(object):
     def mainloop(self) -> None:
         self.__loop = True
         Window.__all_opened.append(self)
+        self.__redraw_all = True
+        self.__master_scene = None
         self.place_objects()
         self.set_grid()
         self.fps_update()
         self.on_start_loop()
+        self.__dispatch_messages()
+        self.__last_activity_time = time.monotonic()
+        self.__idle = False
         while self.__loop:
-            for callback in filter(lambda window_callback: window_callback.can_call(), self.__callback_after.copy()):
-                callback()
-                self.__callback_after.remove(callback)
-            self.__main_clock.tick(Window.__fps)
+            PROFILER.start_frame()
+            pressed_keys = self.__start_input_frame()
+            with PROFILER.section("callbacks"):
+                callbacks_called = self.__call_due_callbacks()
+            if Window.__replayer is None:
+                self.__main_clock.tick(Window.__fps)
+            else:
+                self.__main_clock.tick()
             self.objects.focus_mode_update()
-            self.keyboard.update()
-            self.update()
-            self.draw_and_refresh()
-            self.event_handler()
+            self.keyboard.update(pressed_keys)
+            with PROFILER.section("update"):
+                self.update()
+            if not self.__idle or callbacks_called or self.__redraw_all or Window.__last_drawn_window is not self:
+                self.draw_and_refresh()
+            with PROFILER.section("event_handler"):
+                self.event_handler()
+            Window.__client_socket.flush()
             self.handle_bg_music()
+            if Window.__adaptive_pacing and self.__loop and Window.__replayer is None:
+                self.__wait_for_activity()
 
     def stop(self, force=False, sound=None) -> None:
         self.__loop = False
@@ -225,10 +289,15 @@ class Window(object):
             for window in filter(lambda win: win != self, Window.__all_opened):
                 window.on_quit()
             Window.stop_connection()
-            Window.save_config()
+            THREAD_POOL.shutdown()
+            if Window.__replayer is None:
+                Window.save_config()
+            Window.stop_recording()
+            Window.stop_replay()
             pygame.quit()
             sys.exit(0)
         Window.__all_opened.remove(self)
+        self.__master_scene = None
 
     def on_quit(self) -> None:
         pass
@@ -246,14 +315,40 @@ class Window(object):
         pass
 
     def draw_screen(self, show_fps=True) -> None:
-        self.surface.fill(self.bg_color)
+        with PROFILER.section("draw_screen"):
+            self.__draw_scene(self.surface, show_fps)
+
+    def __draw_scene(self, surface: pygame.Surface, show_fps: bool) -> None:
         if isinstance(self.__master, Window):
-            self.__master.draw_screen(show_fps=False)
-        self.objects.draw(self.surface)
+            if self.__master_scene is None:
+                self.__update_master_scene()
+            surface.blit(self.__master_scene, (0, 0))
+        else:
+            surface.fill(self.bg_color)
+        self.objects.draw(surface)
         if Window.__show_fps is True and show_fps and self.__show_fps_in_this_window:
-            Window.__fps_obj.draw(self.surface)
+            Window.__fps_obj.draw(surface)
+        if PROFILER.overlay_shown and show_fps:
+            PROFILER.draw_overlay(surface)
         if self.__screenshot:
-            pygame.draw.rect(self.surface, WHITE, self.rect, width=30)
+            pygame.draw.rect(surface, WHITE, self.rect, width=30)
+
+    def __update_master_scene(self) -> List[pygame.Rect]:
+        master_dirty_rects = self.__merge_dirty_rects(self.__master.__get_dirty_rects())
+        if self.__master_scene is None or self.__master_scene.get_size() != self.size:
+            self.__master_scene = self.surface.copy()
+            self.__master_scene.set_clip(None)
+            self.__master.__draw_scene(self.__master_scene, show_fps=False)
+        else:
+            for rect in master_dirty_rects:
+                self.__master_scene.set_clip(rect)
+                self.__master.__draw_scene(self.__master_scene, show_fps=False)
+            self.__master_scene.set_clip(None)
+        return master_dirty_rects
+
+    def set_dirty(self) -> None:
+        self.objects.set_dirty()
+        self.__redraw_all = True
 
     @staticmethod
     def set_fps(framerate: int) -> None:
@@ -275,11 +370,131 @@ class Window(object):
     def fps_is_shown() -> bool:
         return Window.__show_fps
 
+    @staticmethod
+    def enable_adaptive_pacing(idle_delay=500, max_idle_sleep=1000) -> None:
+        Window.__adaptive_pacing = True
+        Window.__idle_delay = idle_delay / 1000
+        Window.__max_idle_sleep = max_idle_sleep / 1000
+
+    @staticmethod
+    def disable_adaptive_pacing() -> None:
+        Window.__adaptive_pacing = False
+
+    @staticmethod
+    def adaptive_pacing_enabled() -> bool:
+        return Window.__adaptive_pacing
+
+    @property
+    def idle(self) -> bool:
+        return self.__idle
+
+    def __wait_for_activity(self) -> None:
+        now = time.monotonic()
+        if now - self.__last_activity_time < Window.__idle_delay or self.keyboard.any_pressed() or any(pygame.mouse.get_pressed()) \
+        or Sprite.animation_running():
+            self.__idle = False
+            return
+        self.__idle = True
+        timeout = Window.__max_idle_sleep
+        while self.__callback_after and self.__callback_after[0].cancelled:
+            heapq.heappop(self.__callback_after)
+        if self.__callback_after:
+            timeout = min(timeout, self.__callback_after[0].deadline - now)
+        timeout = int(timeout * 1000)
+        if timeout <= 0:
+            return
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.__waited_event = event
+            self.__last_activity_time = time.monotonic()
+            self.__idle = False
+
+    @staticmethod
+    def start_recording(filepath: str, seed: Optional[int] = None) -> InputRecorder:
+        Window.stop_recording()
+        Window.stop_replay()
+        Window.__recorder = InputRecorder(filepath, seed)
+        return Window.__recorder
+
+    @staticmethod
+    def stop_recording() -> None:
+        if Window.__recorder is not None:
+            Window.__recorder.close()
+            Window.__recorder = None
+
+    @staticmethod
+    def recording() -> bool:
+        return Window.__recorder is not None
+
+    @staticmethod
+    def start_replay(filepath: str) -> InputReplayer:
+        Window.stop_recording()
+        Window.stop_replay()
+        Window.__replayer = InputReplayer(filepath)
+        return Window.__replayer
+
+    @staticmethod
+    def stop_replay() -> None:
+        if Window.__replayer is not None:
+            Window.__replayer.close()
+            Window.__replayer = None
+
+    @staticmethod
+    def replaying() -> bool:
+        return Window.__replayer is not None
+
+    def __start_input_frame(self) -> Optional[KeyStates]:
+        if Window.__replayer is not None:
+            pressed_keys = Window.__replayer.next_frame()
+            if pressed_keys is None:
+                self.stop(force=True)
+            return pressed_keys
+        if Window.__recorder is not None:
+            return Window.__recorder.record_frame(self.keyboard.get_pressed_keys())
+        return None
+
+    def __get_input(self) -> Tuple[Tuple[int, int], List[pygame.event.Event]]:
+        waited_event, self.__waited_event = self.__waited_event, None
+        if Window.__replayer is not None:
+            pygame.event.clear()
+            return Window.__replayer.next_input()
+        mouse_pos = pygame.mouse.get_pos()
+        events = pygame.event.get()
+        if waited_event is not None:
+            events.insert(0, waited_event)
+        if Window.__recorder is not None:
+            Window.__recorder.record_input(mouse_pos, events)
+        return (mouse_pos, events)
+
     def fps_update(self) -> None:
         if Window.__show_fps:
             Window.__fps_obj.message = f"{round(self.__main_clock.get_fps())} FPS"
         self.after(500, self.fps_update)
 
+    @staticmethod
+    def enable_profiler(overlay=True) -> None:
+        PROFILER.budget = 1 / Window.__fps if Window.__fps > 0 else PROFILER.budget
+        PROFILER.enable()
+        PROFILER.show_overlay(overlay)
+
+    @staticmethod
+    def disable_profiler() -> None:
+        PROFILER.disable()
+        PROFILER.show_overlay(False)
+        for window in Window.__all_opened:
+            window.set_dirty()
+
+    @staticmethod
+    def toggle_profiler() -> None:
+        if PROFILER.enabled:
+            Window.disable_profiler()
+        else:
+            Window.enable_profiler()
+
+    @property
+    def profiler(self) -> FrameProfiler:
+        return PROFILER
+
     def show_fps_in_this_window(self, status: bool) -> None:
         self.__show_fps_in_this_window = bool(status)
 
@@ -294,47 +509,132 @@ class Window(object):
                 obj.hide()
 
     def refresh(self) -> None:
-        pygame.display.update(self.rect_to_update or self.rect)
+        with PROFILER.section("refresh"):
+            pygame.display.update(self.rect_to_update or self.rect)
 
     def draw_and_refresh(self, *args, **kwargs) -> None:
-        self.draw_screen(*args, **kwargs)
-        self.refresh()
+        redraw_all = bool(self.__redraw_all or Window.__last_drawn_window is not self or self.rect_to_update)
+        Window.__last_drawn_window = self
+        self.__redraw_all = False
+        if not self.__dirty_rects_enabled:
+            if isinstance(self.__master, Window):
+                self.__update_master_scene()
+            self.draw_screen(*args, **kwargs)
+            self.refresh()
+            return
+        dirty_rects = self.__merge_dirty_rects(self.__get_dirty_rects())
+        if redraw_all or len(dirty_rects) > Window.MAX_DIRTY_RECTS:
+            self.draw_screen(*args, **kwargs)
+            self.refresh()
+            return
+        if not dirty_rects:
+            return
+        surface = self.surface
+        for rect in dirty_rects:
+            surface.set_clip(rect)
+            self.draw_screen(*args, **kwargs)
+        surface.set_clip(None)
+        with PROFILER.section("refresh"):
+            pygame.display.update(dirty_rects)
+
+    def enable_dirty_rects(self) -> None:
+        self.__dirty_rects_enabled = True
+        self.__redraw_all = True
+
+    def disable_dirty_rects(self) -> None:
+        self.__dirty_rects_enabled = False
+
+    def dirty_rects_enabled(self) -> bool:
+        return self.__dirty_rects_enabled
+
+    def __get_dirty_rects(self) -> List[pygame.Rect]:
+        dirty_rects = self.objects.get_dirty_rects()
+        if isinstance(self.__master, Window):
+            dirty_rects.extend(self.__update_master_scene())
+        if Window.__show_fps is True and self.__show_fps_in_this_window:
+            dirty_rects.extend(Window.__fps_obj.get_dirty_rects())
+        if PROFILER.overlay_shown:
+            dirty_rects.append(PROFILER.overlay_rect.copy())
+        return dirty_rects
+
+    def __merge_dirty_rects(self, dirty_rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        screen = self.rect
+        merged_rects = list()
+        for rect in dirty_rects:
+            rect = rect.clip(screen)
+            if rect.width == 0 or rect.height == 0:
+                continue
+            index = rect.collidelist(merged_rects)
+            while index >= 0:
+                rect.union_ip(merged_rects.pop(index))
+                index = rect.collidelist(merged_rects)
+            merged_rects.append(rect)
+        return merged_rects
+
+    def __compile_bindings(self) -> None:
+        bindings_version = (self.__bindings_version, Window.__all_window_bindings_version)
+        if self.__compiled_bindings_version != bindings_version:
+            self.__event_dispatch_table = {
+                event_type: tuple(self.__event_handler_dict.get(event_type, tuple())) + tuple(Window.__all_window_event_handler_dict.get(event_type, tuple()))
+                for event_type in set(self.__event_handler_dict) | set(Window.__all_window_event_handler_dict)
+            }
+            self.__key_state_table = tuple((key_value, tuple(callback_list)) for key_value, callback_list in self.__key_state_dict.items())
+            self.__joystick_state_table = tuple(
+                (self.joystick[device_index], action, tuple(callback_list))
+                for device_index, action_dict in self.__joystick_state_dict.items() if self.joystick[device_index] is not None
+                for action, callback_list in action_dict.items()
+            )
+            self.__compiled_bindings_version = bindings_version
 
     def event_handler(self) -> None:
-        for key_value, callback_list in self.__key_state_dict.items():
+        self.__compile_bindings()
+        mouse_pos, events = self.__get_input()
+        for key_value, callback_list in self.__key_state_table:
+            is_pressed = self.keyboard.is_pressed(key_value)
             for callback in callback_list:
-                callback(key_value, self.keyboard.is_pressed(key_value))
+                callback(key_value, is_pressed)
         for callback in self.__mouse_handler_list:
-            callback(pygame.mouse.get_pos())
-        for device_index in self.__joystick_state_dict:
-            if self.joystick[device_index] is None:
-                continue
-            for action, callback_list in self.__joystick_state_dict[device_index].items():
-                for callback in callback_list:
-                    callback(self.joystick[device_index].get_value(action))
-        for event in pygame.event.get():
+            callback(mouse_pos)
+        mouse_targets = self.__get_mouse_targets(mouse_pos)
+        for clickable in mouse_targets:
+            clickable.mouse_motion(mouse_pos)
+        self.__mouse_targets = [clickable for clickable in mouse_targets if clickable.hover or clickable.active]
+        for joystick, action, callback_list in self.__joystick_state_table:
+            value = joystick.get_value(action)
+            for callback in callback_list:
+                callback(value)
+        if events:
+            self.__last_activity_time = time.monotonic()
+        for event in events:
             if event.type == pygame.QUIT \
             or (event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and (event.mod & pygame.KMOD_LALT)):
                 self.stop(force=True)
             elif event.type == pygame.KEYDOWN:
-                for callback in self.__key_handler_dict.get(event.key, tuple()):
-                    callback(event)
-            elif event.type in [pygame.JOYBUTTONDOWN, pygame.JOYAXISMOTION, pygame.JOYHATMOTION]:
-                joystick = self.joystick.get_joy_by_instance_id(event.instance_id)
-                joystick_handler_dict = self.__joystick_handler_dict.get(joystick.device_index, dict())
-                if event.type == pygame.JOYBUTTONDOWN:
-                    event_handler = {"event_type": "button", "index": event.button}
-                elif event.type == pygame.JOYAXISMOTION:
-                    event_handler = {"event_type": "axis", "index": event.axis}
-                else:
-                    event_handler = {"event_type": "hat", "index": event.hat, "hat_value": event.value}
-                for callback in joystick_handler_dict.get(joystick.search_key(**event_handler), tuple()):
+                for callback in tuple(self.__key_handler_dict.get(event.key, tuple())):
                     callback(event)
-            for callback in self.__event_handler_dict.get(event.type, tuple()):
-                callback(event)
-            for callback in Window.__all_window_event_handler_dict.get(event.type, tuple()):
+            elif event.type in Window.JOYSTICK_EVENTS:
+                self.__handle_joystick_event(event)
+            elif event.type == Window.MESSAGE_RECEIVED_EVENT:
+                self.__dispatch_messages()
+            for callback in self.__event_dispatch_table.get(event.type, tuple()):
                 callback(event)
 
+    def __handle_joystick_event(self, event: pygame.event.Event) -> None:
+        joystick = self.joystick.get_joy_by_instance_id(event.instance_id)
+        if joystick is None:
+            return
+        joystick_handler_dict = self.__joystick_handler_dict.get(joystick.device_index)
+        if not joystick_handler_dict:
+            return
+        if event.type == pygame.JOYBUTTONDOWN:
+            action = joystick.get_action("button", event.button)
+        elif event.type == pygame.JOYAXISMOTION:
+            action = joystick.get_action("axis", event.axis)
+        else:
+            action = joystick.get_action("hat", event.hat, event.value)
+        for callback in tuple(joystick_handler_dict.get(action, tuple())):
+            callback(event)
+
     def set_focus(self, obj: Focusable) -> None:
         self.objects.set_focus(obj)
 
@@ -372,20 +672,33 @@ class Window(object):
         else:
             Focusable.MODE = Focusable.MODE_MOUSE
 
+    def __call_due_callbacks(self) -> bool:
+        now = SESSION_CLOCK.time()
+        due_callbacks = list()
+        while self.__callback_after and self.__callback_after[0].deadline <= now:
+            due_callbacks.append(heapq.heappop(self.__callback_after))
+        called = False
+        for window_callback in due_callbacks:
+            if not window_callback.cancelled:
+                window_callback()
+                called = True
+        return called
+
     def after(self, milliseconds: float, callback: Callable[..., Any]) -> WindowCallback:
         window_callback = WindowCallback(callback, milliseconds)
-        self.__callback_after.append(window_callback)
+        heapq.heappush(self.__callback_after, window_callback)
         return window_callback
 
     def remove_window_callback(self, window_callback: WindowCallback) -> None:
-        if window_callback in self.__callback_after:
-            self.__callback_after.remove(window_callback)
+        if window_callback is not None:
+            window_callback.cancel()
 
     def bind_event(self, event_type: int, callback: Callable[..., Any]) -> None:
         event_list = self.__event_handler_dict.get(event_type)
         if event_list is None:
             event_list = self.__event_handler_dict[event_type] = list()
         event_list.append(callback)
+        self.__bindings_version += 1
 
     @staticmethod
     def bind_event_all_window(event_type: int, callback: Callable[..., Any]) -> None:
@@ -393,10 +706,46 @@ class Window(object):
         if event_list is None:
             event_list = Window.__all_window_event_handler_dict[event_type] = list()
         event_list.append(callback)
+        Window.__all_window_bindings_version += 1
+
+    def bind_message(self, msg: str, callback: Callable[..., Any]) -> None:
+        message_list = self.__message_handler_dict.get(msg)
+        if message_list is None:
+            message_list = self.__message_handler_dict[msg] = list()
+        message_list.append(callback)
+
+    def __dispatch_messages(self) -> None:
+        if self.__loop:
+            Window.__client_socket.dispatch(self.__message_handler_dict)
+
+    @staticmethod
+    def __notify_message_received() -> None:
+        try:
+            pygame.event.post(pygame.event.Event(Window.MESSAGE_RECEIVED_EVENT))
+        except pygame.error:
+            pass
 
     def bind_mouse(self, callback: Callable[..., Any]):
         self.__mouse_handler_list.append(callback)
 
+    def bind_clickable(self, clickable) -> None:
+        if clickable not in self.__clickable_set:
+            self.__clickable_list.append(clickable)
+            self.__clickable_set.add(clickable)
+            self.__clickable_out_of_grid_version = -1
+
+    def __get_mouse_targets(self, mouse_pos: Tuple[int, int]) -> Sequence[Focusable]:
+        if self.__clickable_out_of_grid_version != self.objects.spatial_grid_version:
+            self.__clickable_out_of_grid = [obj for obj in self.__clickable_list if not self.objects.in_spatial_grid(obj)]
+            self.__clickable_out_of_grid_version = self.objects.spatial_grid_version
+        mouse_targets = dict.fromkeys(obj for obj in self.objects.focusable_at(mouse_pos) if obj in self.__clickable_set)
+        mouse_targets.update(dict.fromkeys(self.__mouse_targets))
+        mouse_targets.update(dict.fromkeys(self.__clickable_out_of_grid))
+        focus = self.objects.focus_get()
+        if focus in self.__clickable_set:
+            mouse_targets[focus] = None
+        return list(mouse_targets)
+
     def bind_key(self, key_value: int, callback: Callable[..., Any], hold: Optional[bool] = False) -> None:
         if not hold:
             key_dict = self.__key_handler_dict
@@ -406,6 +755,7 @@ class Window(object):
         if key_list is None:
             key_list = key_dict[key_value] = list()
         key_list.append(callback)
+        self.__bindings_version += 1
 
     def bind_joystick(self, joy_id: int, action: str, callback: Callable[..., Any], state: Optional[bool] = False) -> None:
         if not state:
@@ -419,10 +769,12 @@ class Window(object):
         if joystick_list is None:
             joystick_list = joystick_dict[action] = list()
         joystick_list.append(callback)
+        self.__bindings_version += 1
 
     def screenshot(self) -> None:
         if not self.__screenshot:
             self.__screenshot = True
+            self.__redraw_all = True
             i = 1
             while os.path.isfile(os.path.join(sys.path[0], f"screenshot_{i}.png")):
                 i += 1
@@ -431,6 +783,7 @@ class Window(object):
 
     def __hide_screenshot_frame(self) -> None:
         self.__screenshot = False
+        self.__redraw_all = True
 
     def handle_bg_music(self) -> None:
         if (not Window.__enable_music or self.bg_music is None) and pygame.mixer.get_busy():
@@ -0,0 +1,235 @@
+# -*- coding: Utf-8 -*
+
+import random
+from typing import Sequence, Dict, Any, Tuple, List, Optional
+from .constants import NB_LINES_BOXES, NB_COLUMNS_BOXES, NB_SHIPS, SHIPS
+
+class BoardShip(object):
+
+    __slots__ = ("name", "boxes", "orient", "mask")
+
+    def __init__(self, name: str, boxes: Sequence[Tuple[int, int]], orient: str, mask: int):
+        self.name = name
+        self.boxes = [tuple(box_pos) for box_pos in boxes]
+        self.orient = orient
+        self.mask = mask
+
+    def get_setup(self) -> Dict[str, Any]:
+        return {"name": self.name, "boxes": list(self.boxes), "orient": self.orient}
+
+class Board(object):
+
+    NO_HIT = 0
+    HATCH = 1
+    CROSS = 2
+    SHIP_DESTROYED = 3
+
+    VERTICAL = "vertical"
+    HORIZONTAL = "horizontal"
+
+    def __init__(self, nb_lines=NB_LINES_BOXES, nb_columns=NB_COLUMNS_BOXES, nb_ships=NB_SHIPS):
+        self.__nb_lines = int(nb_lines)
+        self.__nb_columns = int(nb_columns)
+        self.__nb_ships = int(nb_ships)
+        self.__around_masks = list()
+        for line in range(self.__nb_lines):
+            for column in range(self.__nb_columns):
+                mask = 0
+                for u in range(max(line - 1, 0), min(line + 2, self.__nb_lines)):
+                    for v in range(max(column - 1, 0), min(column + 2, self.__nb_columns)):
+                        mask |= self.bit(u, v)
+                self.__around_masks.append(mask)
+        self.__ships = list()
+        self.__cell_ship = [None] * (self.__nb_lines * self.__nb_columns)
+        self.__ships_mask = 0
+        self.__blocked_mask = 0
+        self.__shots_mask = 0
+        self.__destroyed_mask = 0
+        self.__nb_destroyed = 0
+
+    @property
+    def nb_lines(self) -> int:
+        return self.__nb_lines
+
+    @property
+    def nb_columns(self) -> int:
+        return self.__nb_columns
+
+    @property
+    def nb_ships(self) -> int:
+        return self.__nb_ships
+
+    @property
+    def ships(self) -> Sequence[BoardShip]:
+        return tuple(self.__ships)
+
+    @property
+    def shots_mask(self) -> int:
+        return self.__shots_mask
+
+    @property
+    def nb_destroyed_ships(self) -> int:
+        return self.__nb_destroyed
+
+    def reset(self) -> None:
+        self.__ships.clear()
+        self.__cell_ship = [None] * (self.__nb_lines * self.__nb_columns)
+        self.__ships_mask = self.__blocked_mask = 0
+        self.__shots_mask = self.__destroyed_mask = 0
+        self.__nb_destroyed = 0
+
+    def in_board(self, line: int, column: int) -> bool:
+        return 0 <= line < self.__nb_lines and 0 <= column < self.__nb_columns
+
+    def bit(self, line: int, column: int) -> int:
+        return 1 << (line * self.__nb_columns + column)
+
+    def mask_from_boxes(self, boxes: Sequence[Tuple[int, int]]) -> int:
+        mask = 0
+        for line, column in boxes:
+            mask |= self.bit(line, column)
+        return mask
+
+    def boxes_from_mask(self, mask: int) -> List[Tuple[int, int]]:
+        boxes = list()
+        while mask:
+            low_bit = mask & -mask
+            index = low_bit.bit_length() - 1
+            boxes.append(divmod(index, self.__nb_columns))
+            mask ^= low_bit
+        return boxes
+
+    def get_area_mask(self, mask: int) -> int:
+        area = 0
+        while mask:
+            low_bit = mask & -mask
+            area |= self.__around_masks[low_bit.bit_length() - 1]
+            mask ^= low_bit
+        return area
+
+    def get_ship_boxes(self, line: int, column: int, size: int, orient: str) -> Optional[List[Tuple[int, int]]]:
+        if orient == Board.VERTICAL:
+            boxes = [(line + i, column) for i in range(size)]
+        else:
+            boxes = [(line, column + i) for i in range(size)]
+        if not all(self.in_board(*box_pos) for box_pos in boxes):
+            return None
+        return boxes
+
+    def get_blocked_mask(self, ignore: Optional[BoardShip] = None) -> int:
+        if ignore is None or ignore not in self.__ships:
+            return self.__blocked_mask
+        blocked_mask = 0
+        for ship in filter(lambda ship: ship is not ignore, self.__ships):
+            blocked_mask |= self.get_area_mask(ship.mask)
+        return blocked_mask
+
+    def is_free(self, line: int, column: int, ignore: Optional[BoardShip] = None) -> bool:
+        return self.in_board(line, column) and not (self.get_blocked_mask(ignore) & self.bit(line, column))
+
+    def valid_placement(self, boxes: Sequence[Tuple[int, int]], ignore: Optional[BoardShip] = None) -> bool:
+        if not boxes or not all(self.in_board(*box_pos) for box_pos in boxes):
+            return False
+        return not (self.get_blocked_mask(ignore) & self.mask_from_boxes(boxes))
+
+    def get_available_positions(self, size: int, orient: str, ignore: Optional[BoardShip] = None) -> List[Tuple[int, int]]:
+        blocked_mask = self.get_blocked_mask(ignore)
+        available_positions = list()
+        for line in range(self.__nb_lines):
+            for column in range(self.__nb_columns):
+                boxes = self.get_ship_boxes(line, column, size, orient)
+                if boxes is not None and not (blocked_mask & self.mask_from_boxes(boxes)):
+                    available_positions.append((line, column))
+        return available_positions
+
+    def add_ship(self, name: str, boxes: Sequence[Tuple[int, int]], orient: str) -> BoardShip:
+        if not boxes or not all(self.in_board(*box_pos) for box_pos in boxes):
+            raise ValueError(f"Ship {name!r} is outside the board")
+        ship = BoardShip(name, boxes, orient, self.mask_from_boxes(boxes))
+        self.__ships.append(ship)
+        for line, column in ship.boxes:
+            self.__cell_ship[line * self.__nb_columns + column] = ship
+        self.__ships_mask |= ship.mask
+        self.__blocked_mask |= self.get_area_mask(ship.mask)
+        if ship.mask & self.__shots_mask == ship.mask:
+            self.__set_ship_destroyed(ship)
+        return ship
+
+    def add_random_ship(self, name: str, size: int) -> BoardShip:
+        orient = random.choice([Board.HORIZONTAL, Board.VERTICAL])
+        line, column = random.choice(self.get_available_positions(size, orient))
+        return self.add_ship(name, self.get_ship_boxes(line, column, size, orient), orient)
+
+    def shuffle(self) -> None:
+        while True:
+            self.reset()
+            try:
+                for ship_name, ship_infos in SHIPS.items():
+                    for _ in range(ship_infos["nb"]):
+                        self.add_random_ship(ship_name, ship_infos["size"])
+            except IndexError:
+                continue
+            break
+
+    def remove_ship(self, ship: BoardShip) -> None:
+        if ship not in self.__ships:
+            return
+        self.__ships.remove(ship)
+        for line, column in ship.boxes:
+            self.__cell_ship[line * self.__nb_columns + column] = None
+        self.__ships_mask &= ~ship.mask
+        self.__blocked_mask = 0
+        for other_ship in self.__ships:
+            self.__blocked_mask |= self.get_area_mask(other_ship.mask)
+        if self.__destroyed_mask & ship.mask:
+            self.__destroyed_mask &= ~ship.mask
+            self.__nb_destroyed -= 1
+
+    def get_ship(self, line: int, column: int) -> Optional[BoardShip]:
+        if not self.in_board(line, column):
+            return None
+        return self.__cell_ship[line * self.__nb_columns + column]
+
+    def ship_destroyed(self, ship: BoardShip) -> bool:
+        return bool(self.__destroyed_mask & ship.mask)
+
+    def is_shot(self, line: int, column: int) -> bool:
+        return bool(self.__shots_mask & self.bit(line, column))
+
+    def mark(self, line: int, column: int) -> None:
+        self.__shots_mask |= self.bit(line, column)
+        ship = self.get_ship(line, column)
+        if ship is not None and not self.ship_destroyed(ship) and ship.mask & self.__shots_mask == ship.mask:
+            self.__set_ship_destroyed(ship)
+
+    def shoot(self, line: int, column: int) -> Tuple[bool, Optional[BoardShip]]:
+        ship = self.get_ship(line, column)
+        already_destroyed = ship is not None and self.ship_destroyed(ship)
+        self.mark(line, column)
+        if ship is None:
+            return (False, None)
+        if not already_destroyed and self.ship_destroyed(ship):
+            return (True, ship)
+        return (True, None)
+
+    def get_boxes_around(self, ship: BoardShip) -> List[Tuple[int, int]]:
+        return self.boxes_from_mask(self.get_area_mask(ship.mask) & ~ship.mask & ~self.__shots_mask)
+
+    def __set_ship_destroyed(self, ship: BoardShip) -> None:
+        self.__destroyed_mask |= ship.mask
+        self.__nb_destroyed += 1
+
+    def destroyed(self) -> bool:
+        return self.__nb_destroyed == self.__nb_ships
+
+    def get_state(self, line: int, column: int) -> int:
+        bit = self.bit(line, column)
+        if not self.__shots_mask & bit:
+            return Board.NO_HIT
+        if not self.__ships_mask & bit:
+            return Board.HATCH
+        return Board.SHIP_DESTROYED if self.__destroyed_mask & bit else Board.CROSS
+
+    @property
+    def map(self) -> Dict[Tuple[int, int], int]:
+        return {(line, column): self.get_state(line, column) for line in range(self.__nb_lines) for column in range(self.__nb_columns)}
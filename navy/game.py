@@ -4,22 +4,19 @@ import socket
 import select
 import pickle
 import random
-import json
 import pygame
-from typing import Sequence, Dict, Any, Tuple, Union
+from typing import Sequence, Dict, Any, Tuple, Union, List, Optional
 from my_pygame import Window, DrawableList, DrawableListHorizontal, DrawableListVertical
 from my_pygame import Image, ImageButton, Text, RectangleShape, Button, Sprite
 from my_pygame import GREEN, GREEN_DARK, GREEN_LIGHT, BLACK, WHITE, YELLOW, TRANSPARENT, RED, RED_DARK
-from my_pygame import ClientSocket
-from .constants import RESOURCES, NB_LINES_BOXES, NB_COLUMNS_BOXES, BOX_SIZE, NB_SHIPS
+from my_pygame import ClientSocket, THREAD_POOL
+from my_pygame.protocol import MESSAGE_CODEC, PEER_SUSPENDED_MESSAGE, PEER_RESUMED_MESSAGE
+from .constants import RESOURCES, NB_LINES_BOXES, NB_COLUMNS_BOXES, BOX_SIZE
+from .board import Board, BoardShip
+from .ai import ProbabilityAI
+from .protocol import register_messages
 
-def print_navy_map(navy_map: Dict[Tuple[int, int], int], higlight_box=None) -> None:
-    navy_list = [[0 for _ in range(NB_COLUMNS_BOXES)] for _ in range(NB_LINES_BOXES)]
-    for (l, c), value in navy_map.items():
-        navy_list[l][c] = value if higlight_box is None or (l, c) != tuple(higlight_box) else f"({value})"
-    for line in navy_list:
-        print(line)
-    print("-" * NB_COLUMNS_BOXES)
+register_messages(MESSAGE_CODEC)
 
 class Box(Button):
     def __init__(self, master, navy, size: Tuple[int, int], pos: Tuple[int, int]):
@@ -97,19 +94,22 @@ class Ship(Image):
 
 class Navy(DrawableListVertical):
 
-    BOX_NO_HIT = 0
-    BOX_HATCH = 1
-    BOX_CROSS = 2
-    BOX_SHIP_DESTROYED = 3
+    BOX_NO_HIT = Board.NO_HIT
+    BOX_HATCH = Board.HATCH
+    BOX_CROSS = Board.CROSS
+    BOX_SHIP_DESTROYED = Board.SHIP_DESTROYED
 
     def __init__(self, master):
         DrawableListVertical.__init__(self, offset=0, bg_color=(0, 157, 255))
         self.master = master
+        self.board = Board()
+        self.__box_grid = list()
         for i in range(NB_LINES_BOXES):
             box_line = DrawableListHorizontal(offset=0)
             for j in range(NB_COLUMNS_BOXES):
                 box = Box(master, navy=self, size=BOX_SIZE, pos=(i, j))
                 box_line.add(box)
+            self.__box_grid.append(box_line.list)
             self.add(box_line)
         self.ships_list = DrawableList()
         self.box_hit_img = DrawableList()
@@ -119,6 +119,7 @@ class Navy(DrawableListVertical):
             self.add_ship(Ship(**ship_infos))
 
     def reset(self) -> None:
+        self.board.reset()
         self.ships_list.clear()
         self.box_hit_img.clear()
         for box in self.boxes:
@@ -126,24 +127,27 @@ class Navy(DrawableListVertical):
 
     @property
     def map(self) -> Dict[Tuple[int, int], int]:
-        navy_map = {box.pos: Navy.BOX_NO_HIT if box.state == Button.NORMAL else Navy.BOX_HATCH for box in self.boxes}
-        for box_pos in filter(lambda pos: navy_map[pos] == Navy.BOX_HATCH, navy_map):
-            for ship in self.ships:
-                if box_pos in ship.boxes_pos:
-                    navy_map[box_pos] = Navy.BOX_SHIP_DESTROYED if ship.destroyed() else Navy.BOX_CROSS
-                    break
-        return navy_map
+        return self.board.map
 
     def after_drawing(self, surface: pygame.Surface) -> None:
         self.ships_list.draw(surface)
         self.box_hit_img.draw(surface)
 
+    def get_drawn_rects(self) -> List[pygame.Rect]:
+        return DrawableListVertical.get_drawn_rects(self) + self.ships_list.get_drawn_rects() + self.box_hit_img.get_drawn_rects()
+
+    def get_dirty_rects(self) -> List[pygame.Rect]:
+        return DrawableListVertical.get_dirty_rects(self) + self.ships_list.get_dirty_rects() + self.box_hit_img.get_dirty_rects()
+
     def add_ship(self, ship: Ship) -> None:
+        self.board.add_ship(ship.name, ship.boxes_pos, ship.orient)
         self.ships_list.add(ship)
         self.move()
 
     def get_box(self, line: int, column: int) -> Box:
-        return {box.pos: box for box in self.boxes}.get((line, column))
+        if 0 <= line < NB_LINES_BOXES and 0 <= column < NB_COLUMNS_BOXES:
+            return self.__box_grid[line][column]
+        return None
 
     def set_box_clickable(self, click: bool) -> None:
         for box in self.boxes:
@@ -156,7 +160,7 @@ class Navy(DrawableListVertical):
             box.hover = False
 
     def destroyed(self) -> bool:
-        return len(self.ships) == NB_SHIPS and all(ship.destroyed() for ship in self.ships)
+        return self.board.destroyed()
 
     @property
     def boxes(self) -> Sequence[Box]:
@@ -169,12 +173,13 @@ class Navy(DrawableListVertical):
     def move(self, **kwargs):
         DrawableListVertical.move(self, **kwargs)
         for ship in self.ships:
-            ship.place_ship(list(filter(lambda box: box.pos in ship.boxes_pos, self.boxes)))
+            ship.place_ship([self.get_box(*box_pos) for box_pos in ship.boxes_pos])
 
     def box_hit(self, box: Box) -> bool:
         return False
 
     def set_box_hit(self, box: Box, hit: bool) -> None:
+        self.board.mark(*box.pos)
         box.state = Button.DISABLED
         hit = bool(hit)
         img = {False: "hatch", True: "cross"}[hit]
@@ -182,25 +187,11 @@ class Navy(DrawableListVertical):
         image.center = box.center
         self.box_hit_img.add(image)
 
-    def hit_all_boxes_around_ship(self, ship: Ship):
-        offsets = [
-            (-1, -1),
-            (0, -1),
-            (1, -1),
-            (-1, 0),
-            (1, 0),
-            (-1, 1),
-            (0, 1),
-            (1, 1)
-        ]
-        for box in ship.boxes_covered:
-            line, column = box.pos
-            for u, v in offsets:
-                box = self.get_box(line + u, column + v)
-                if box is None:
-                    continue
-                if box.state == Button.NORMAL:
-                    self.set_box_hit(box, False)
+    def hit_all_boxes_around_ship(self, ship: Union[Ship, BoardShip]):
+        if isinstance(ship, Ship):
+            ship = self.board.get_ship(*ship.boxes_pos[0])
+        for box_pos in self.board.get_boxes_around(ship):
+            self.set_box_hit(self.get_box(*box_pos), False)
 
 class PlayerNavy(Navy):
     def __init__(self, master, player: ClientSocket):
@@ -209,84 +200,110 @@ class PlayerNavy(Navy):
         self.client_socket = player
 
     def box_hit(self, box: Box) -> bool:
+        attack_result = self.receive_attack(box)
+        self.client_socket.send("attack_result", attack_result)
+        return attack_result["hit"]
+
+    def receive_attack(self, box: Box, sound=True) -> Dict[str, Any]:
         attack_result = {
             "hit": False,
             "ship_destroyed": None
         }
-        for ship in self.ships:
-            if box in ship.boxes_covered:
-                self.set_box_hit(box, True)
-                attack_result["hit"] = True
-                if ship.destroyed():
+        hit, ship_destroyed = self.board.shoot(*box.pos)
+        if hit:
+            self.set_box_hit(box, True)
+            attack_result["hit"] = True
+            if ship_destroyed is not None:
+                if sound:
                     RESOURCES.play_sfx("destroy")
-                    self.hit_all_boxes_around_ship(ship)
-                    attack_result["ship_destroyed"] = ship.get_setup()
-                else:
-                    RESOURCES.play_sfx("explosion")
-                self.client_socket.send("attack_result", attack_result)
-                return True
-        self.client_socket.send("attack_result", attack_result)
-        RESOURCES.play_sfx("splash")
+                self.hit_all_boxes_around_ship(ship_destroyed)
+                attack_result["ship_destroyed"] = ship_destroyed.get_setup()
+            elif sound:
+                RESOURCES.play_sfx("explosion")
+            return attack_result
+        if sound:
+            RESOURCES.play_sfx("splash")
         self.set_box_hit(box, False)
-        return False
+        return attack_result
 
     def send_non_destroyed_ships(self):
-        self.client_socket.send("non_destroyed_ships", [ship.get_setup() for ship in filter(lambda ship: not ship.destroyed(), self.ships)])
+        self.client_socket.send("non_destroyed_ships", [ship.get_setup() for ship in filter(lambda ship: not self.board.ship_destroyed(ship), self.board.ships)])
 
 class OppositeNavy(Navy):
     def __init__(self, master, player: ClientSocket):
         Navy.__init__(self, master)
         self.client_socket = player
-        self.ai_setup = list()
+        self.ai_board = Board()
+        self.pending_attack = None
 
-    def box_hit(self, box: Box) -> bool:
+    def reset(self) -> None:
+        Navy.reset(self)
+        self.pending_attack = None
+
+    @property
+    def ai_setup(self) -> Sequence[Dict[str, Any]]:
+        return [ship.get_setup() for ship in filter(lambda ship: not self.ai_board.ship_destroyed(ship), self.ai_board.ships)]
+
+    @ai_setup.setter
+    def ai_setup(self, setup: Sequence[Dict[str, Any]]) -> None:
+        self.ai_board.reset()
+        for ship_infos in setup:
+            self.ai_board.add_ship(ship_infos["name"], ship_infos["boxes"], ship_infos["orient"])
+
+    def box_hit(self, box: Box) -> Optional[bool]:
         if not self.client_socket.connected():
             return self.ai_box_hit(box)
         return self.player_box_hit(box)
 
     def ai_box_hit(self, box: Box) -> bool:
-        for ship_infos in self.ai_setup.copy():
-            boxes_covered = list(filter(lambda box: box.pos in ship_infos["boxes"], self.boxes))
-            if box in boxes_covered:
-                self.set_box_hit(box, True)
-                if all(box.state == Button.DISABLED for box in boxes_covered):
-                    RESOURCES.play_sfx("destroy")
-                    ship = Ship(**ship_infos)
-                    self.ai_setup.remove(ship_infos)
-                    self.add_ship(ship)
-                    self.hit_all_boxes_around_ship(ship)
-                else:
-                    RESOURCES.play_sfx("explosion")
-                return True
+        hit, ship_destroyed = self.ai_board.shoot(*box.pos)
+        if hit:
+            self.set_box_hit(box, True)
+            if ship_destroyed is not None:
+                RESOURCES.play_sfx("destroy")
+                ship = Ship(**ship_destroyed.get_setup())
+                self.add_ship(ship)
+                self.hit_all_boxes_around_ship(ship)
+            else:
+                RESOURCES.play_sfx("explosion")
+            return True
         self.set_box_hit(box, False)
         RESOURCES.play_sfx("splash")
         return False
 
-    def player_box_hit(self, box: Box) -> bool:
-        self.client_socket.send("attack", json.dumps(box.pos))
-        attack_result = self.client_socket.get(self.client_socket.wait_for("attack_result"))
-        if not isinstance(attack_result, dict):
-            return False
+    def player_box_hit(self, box: Box) -> None:
+        self.client_socket.send("attack", box.pos)
+        self.pending_attack = box
+        self.set_box_clickable(False)
+        return None
+
+    def receive_attack_result(self, attack_result: Dict[str, Any]) -> Optional[bool]:
+        box, self.pending_attack = self.pending_attack, None
+        if box is None or not isinstance(attack_result, dict):
+            return None
+        return self.apply_attack_result(box, attack_result)
+
+    def apply_attack_result(self, box: Box, attack_result: Dict[str, Any], sound=True) -> bool:
         if attack_result["hit"]:
             self.set_box_hit(box, True)
             if attack_result["ship_destroyed"] is not None:
                 ship_infos = attack_result["ship_destroyed"]
-                RESOURCES.play_sfx("destroy")
+                if sound:
+                    RESOURCES.play_sfx("destroy")
                 ship = Ship(**ship_infos)
                 self.add_ship(ship)
                 self.hit_all_boxes_around_ship(ship)
-            else:
+            elif sound:
                 RESOURCES.play_sfx("explosion")
             return True
         self.set_box_hit(box, False)
-        RESOURCES.play_sfx("splash")
+        if sound:
+            RESOURCES.play_sfx("splash")
         return False
 
-    def show_all_non_destroyed_ships(self) -> Sequence[Ship]:
-        if not self.client_socket.connected():
+    def show_all_non_destroyed_ships(self, ship_setup: Optional[Sequence[Dict[str, Any]]] = None) -> Sequence[Ship]:
+        if ship_setup is None:
             ship_setup = self.ai_setup
-        else:
-            ship_setup = self.client_socket.get(self.client_socket.wait_for("non_destroyed_ships"))
         all_ships = list()
         for ship_infos in ship_setup:
             ship = Ship(**ship_infos)
@@ -313,61 +330,6 @@ class TurnArrow(Sprite):
         self.__turn = bool(state)
         self.set_sprite_list(self.__turn)
 
-class AI:
-    def __init__(self):
-        self.box_hitted = list()
-        self.possibilities = list()
-
-    def reset(self) -> None:
-        self.box_hitted.clear()
-        self.possibilities = [(i, j) for i in range(NB_LINES_BOXES) for j in range(NB_COLUMNS_BOXES)]
-
-    def play(self, navy_map: Dict[Tuple[int, int], int]) -> Tuple[int, int]:
-        for box_pos in filter(lambda pos: navy_map[pos] == Navy.BOX_SHIP_DESTROYED, self.box_hitted.copy()):
-            self.box_hitted.remove(box_pos)
-        for box_pos in filter(lambda pos: navy_map[pos] != Navy.BOX_NO_HIT, self.possibilities.copy()):
-            if navy_map[box_pos] == Navy.BOX_CROSS:
-                self.box_hitted.append(box_pos)
-            self.possibilities.remove(box_pos)
-        if self.box_hitted:
-            return self.track_ship(navy_map)
-        return random.choice(self.possibilities)
-
-    def track_ship(self, navy_map: Dict[Tuple[int, int], int]) -> Tuple[int, int]:
-        if len(self.box_hitted) == 1:
-            return self.find_ship(navy_map, *self.box_hitted[0])
-        self.box_hitted.sort()
-        index = 1 if self.box_hitted[0][0] == self.box_hitted[-1][0] else 0
-        first, second = list(self.box_hitted[0]), list(self.box_hitted[-1])
-        first[index] -= 1
-        second[index] += 1
-        potential_boxes = list()
-        for x, y in [first, second]:
-            if (x, y) in navy_map and navy_map[x, y] == Navy.BOX_NO_HIT:
-                potential_boxes.append((x, y))
-        if not potential_boxes:
-            print_navy_map(navy_map)
-            print(f"IndexError: {e}")
-            exit(1)
-        return random.choice(potential_boxes)
-
-    def find_ship(self, navy_map: Dict[Tuple[int, int], int], line: int, column: int) -> Tuple[int, int]:
-        offsets = [
-            (0, -1),
-            (-1, 0),
-            (1, 0),
-            (0, 1)
-        ]
-        potential_boxes = list()
-        for pos in [(line + u, column + v) for u, v in offsets]:
-            if pos in navy_map and navy_map[pos] == Navy.BOX_NO_HIT:
-                potential_boxes.append(pos)
-        if not potential_boxes:
-            print_navy_map(navy_map, higlight_box=(line, column))
-            print(f"IndexError: {e}")
-            exit(1)
-        return random.choice(potential_boxes)
-
 class FinishWindow(Window):
     def __init__(self, master, victory: bool):
         Window.__init__(self, master=master, bg_music=None if victory is None else RESOURCES.MUSIC["end"])
@@ -390,15 +352,23 @@ class FinishWindow(Window):
         self.button_restart = Button(self, "Restart", callback=self.restart, **params_for_all_buttons)
         self.button_return_to_menu = Button(self, "Return to menu", callback=self.stop, **params_for_all_buttons)
         self.ask_restart = False
+        self.enemy_ask_restart = False
         self.bind_key(pygame.K_ESCAPE, lambda event: self.stop())
+        self.bind_message("restart", self.on_enemy_restart)
+        self.bind_message("quit", self.on_enemy_quit)
 
-    def update(self):
+    def on_start_loop(self):
+        if self.victory is not None and self.master.enemy_quit:
+            self.on_enemy_quit(None)
+
+    def on_enemy_restart(self, data):
+        self.enemy_ask_restart = True
         if self.ask_restart:
-            if self.master.client_socket.recv("restart"):
-                self.master.restart = True
-                self.stop()
-            elif self.master.client_socket.recv("quit"):
-                self.text_finish.message = "The enemy has left\nthe game"
+            self.master.restart = True
+            self.stop()
+
+    def on_enemy_quit(self, data):
+        self.text_finish.message = "The enemy has left\nthe game"
 
     def place_objects(self):
         self.frame.center = self.center
@@ -417,30 +387,52 @@ class FinishWindow(Window):
             self.text_finish.message = "Waiting for\nenemy response"
             self.button_restart.hide()
             self.button_return_to_menu.move(bottom=self.frame.bottom - 20, centerx=self.frame.centerx)
+            if self.enemy_ask_restart:
+                self.master.restart = True
+                self.stop()
         else:
             self.master.restart = True
             self.stop()
 
 class Gameplay(Window):
-    def __init__(self, player: int):
+
+    RECONNECT_ATTEMPTS = 10
+    RECONNECT_TIMEOUT = 1
+
+    def __init__(self, player: int, ai_class=ProbabilityAI):
         Window.__init__(self, bg_color=(0, 200, 255), bg_music=RESOURCES.MUSIC["gameplay"])
         self.player_id = player
         self.button_back = ImageButton(self, RESOURCES.IMG["arrow_blue"], rotate=180, size=50, callback=self.stop, highlight_color=YELLOW)
         self.player_grid = PlayerNavy(self, self.client_socket)
         self.opposite_grid = OppositeNavy(self, self.client_socket)
-        self.ai = AI()
+        self.ai = ai_class()
         self.turn_checker = TurnArrow()
         self.restart = False
         self.bind_key(pygame.K_ESCAPE, lambda event: self.stop())
         self.text_finish = Text("Finish !!!", font=(None, 120), color=WHITE)
+        self.text_reconnect = Text("Connection lost, reconnecting...", font=(None, 50), color=WHITE)
+        self.text_reconnect.hide()
         self.game_finished = False
+        self.enemy_quit = False
+        self.reconnecting = False
+        self.resume_job = None
+        self.bind_message("attack", self.on_enemy_attack)
+        self.bind_message("attack_result", self.on_attack_result)
+        self.bind_message("turn", self.on_default_turn)
+        self.bind_message("non_destroyed_ships", self.on_enemy_ships)
+        self.bind_message("quit", self.on_enemy_quit)
+        self.bind_message(PEER_SUSPENDED_MESSAGE, self.on_enemy_suspended)
+        self.bind_message(PEER_RESUMED_MESSAGE, self.on_enemy_resumed)
+        self.enable_dirty_rects()
 
     def start(self, navy_setup: Sequence[Dict[str, Any]], ai_setup=None) -> None:
         self.player_grid.load_setup(navy_setup)
         self.opposite_grid.ai_setup = ai_setup or list()
-        self.turn_checker.turn = self.get_default_turn()
-        self.game_finished = self.restart = False
+        self.game_finished = self.restart = self.enemy_quit = self.reconnecting = False
+        self.resume_job = None
+        self.text_reconnect.hide()
         self.ai.reset()
+        self.set_default_turn()
         self.mainloop()
 
     def on_quit(self) -> None:
@@ -454,7 +446,8 @@ class Gameplay(Window):
             return
         if self.player_grid.destroyed():
             self.opposite_grid.set_box_clickable(False)
-            self.highlight_ships(self.opposite_grid.show_all_non_destroyed_ships())
+            if not self.client_socket.connected():
+                self.highlight_ships(self.opposite_grid.show_all_non_destroyed_ships())
             self.after(3000, lambda victory=False: self.finish(victory))
             self.game_finished = True
         elif self.opposite_grid.destroyed():
@@ -462,23 +455,117 @@ class Gameplay(Window):
             self.player_grid.send_non_destroyed_ships()
             self.after(3000, lambda victory=True: self.finish(victory))
             self.game_finished = True
-        elif self.client_socket.connected():
-            if self.client_socket.recv("attack"):
-                self.hit_a_box(self.player_grid, json.loads(self.client_socket.get("attack")))
-            elif self.client_socket.recv("quit"):
+
+    def on_enemy_attack(self, box_pos: Tuple[int, int]):
+        if not self.game_finished and not self.reconnecting:
+            self.hit_a_box(self.player_grid, box_pos)
+
+    def on_attack_result(self, attack_result: Dict[str, Any]):
+        if self.game_finished or self.reconnecting:
+            return
+        hitted = self.opposite_grid.receive_attack_result(attack_result)
+        if hitted is not None:
+            self.handle_hit(self.opposite_grid, hitted)
+
+    def on_default_turn(self, turn: bool):
+        if not self.game_finished and not self.reconnecting:
+            self.set_turn(turn)
+
+    def on_enemy_ships(self, ship_setup: Sequence[Dict[str, Any]]):
+        self.highlight_ships(self.opposite_grid.show_all_non_destroyed_ships(ship_setup))
+
+    def on_enemy_quit(self, data):
+        if self.reconnecting:
+            return
+        if self.game_finished:
+            self.enemy_quit = True
+        elif self.client_socket.connection_lost and self.client_socket.session is not None:
+            self.reconnecting = True
+            self.opposite_grid.set_box_clickable(False)
+            self.text_reconnect.message = "Connection lost, reconnecting..."
+            self.text_reconnect.show()
+            self.after(1000, lambda: self.resume_game(Gameplay.RECONNECT_ATTEMPTS))
+        else:
+            self.finish(None)
+
+    def on_enemy_suspended(self, grace_period: float):
+        if self.game_finished or self.reconnecting:
+            return
+        self.opposite_grid.set_box_clickable(False)
+        self.text_reconnect.message = f"Opponent disconnected, waiting {round(grace_period)}s for reconnection..."
+        self.text_reconnect.show()
+
+    def on_enemy_resumed(self, data):
+        if self.reconnecting:
+            return
+        self.text_reconnect.hide()
+        if not self.game_finished and self.turn_checker.turn is True and self.opposite_grid.pending_attack is None:
+            self.opposite_grid.set_box_clickable(True)
+
+    def resume_game(self, attempts: int) -> None:
+        self.resume_job = THREAD_POOL.submit(self.client_socket.resume_session, Gameplay.RECONNECT_TIMEOUT)
+        self.after(100, lambda: self.check_resume(attempts))
+
+    def check_resume(self, attempts: int) -> None:
+        if self.resume_job is None:
+            return
+        if not self.resume_job.done():
+            self.after(100, lambda: self.check_resume(attempts))
+            return
+        log = self.resume_job.result() if self.resume_job.exception() is None else None
+        self.resume_job = None
+        if log is None:
+            if attempts > 1 and self.client_socket.session is not None:
+                self.after(1000, lambda: self.resume_game(attempts - 1))
+            else:
+                self.reconnecting = False
                 self.finish(None)
+            return
+        self.reconnecting = False
+        self.text_reconnect.hide()
+        self.replay(log)
+
+    def replay(self, log: Sequence[Tuple[bool, str, Any]]) -> None:
+        navy_setup = [ship.get_setup() for ship in self.player_grid.ships]
+        self.player_grid.reset()
+        self.opposite_grid.reset()
+        self.player_grid.load_setup(navy_setup)
+        game_start = max((i for i, (own, msg, data) in enumerate(log) if msg == "turn"), default=0)
+        turn = self.turn_checker.turn
+        player_attack = enemy_attack = None
+        for own, msg, data in log[game_start:]:
+            if msg == "turn":
+                turn = not data if own else bool(data)
+            elif msg == "attack":
+                if own:
+                    player_attack = tuple(data)
+                else:
+                    enemy_attack = tuple(data)
+            elif msg == "attack_result":
+                if not own and player_attack is not None:
+                    turn = self.opposite_grid.apply_attack_result(self.opposite_grid.get_box(*player_attack), data, sound=False)
+                    player_attack = None
+                elif own and enemy_attack is not None:
+                    turn = not self.player_grid.receive_attack(self.player_grid.get_box(*enemy_attack), sound=False)["hit"]
+                    enemy_attack = None
+        self.set_turn(turn)
+        if player_attack is not None:
+            self.opposite_grid.pending_attack = self.opposite_grid.get_box(*player_attack)
+            self.opposite_grid.set_box_clickable(False)
+        if enemy_attack is not None:
+            self.on_enemy_attack(enemy_attack)
 
-    def get_default_turn(self) -> bool:
+    def set_default_turn(self) -> None:
         if not self.client_socket.connected():
-            return True
-        if self.player_id == 1:
-            my_turn = random.choice([True, False])
-            self.client_socket.send("turn", not my_turn)
-            return my_turn
-        result = self.client_socket.wait_for("turn")
-        if result == "quit":
-            return False
-        return bool(self.client_socket.get("turn"))
+            turn = True
+        elif self.player_id == 1:
+            turn = random.choice([True, False])
+            self.client_socket.send("turn", not turn)
+        else:
+            # The first player picks who starts, the turn is set when its message arrives
+            turn = False
+        self.turn_checker.turn = turn
+        self.opposite_grid.set_box_clickable(turn)
 
     def finish(self, victory: bool):
         FinishWindow(self, victory).mainloop()
@@ -493,6 +580,7 @@ class Gameplay(Window):
     def place_objects(self):
         self.button_back.move(x=20, y=20)
         self.text_finish.move(y=20, centerx=self.centerx)
+        self.text_reconnect.move(bottom=self.bottom - 20, centerx=self.centerx)
         self.player_grid.move(x=20, centery=self.centery)
         self.opposite_grid.move(right=self.right - 20, centery=self.centery)
         self.turn_checker.resize_all_sprites(width=self.opposite_grid.left - self.player_grid.right - 150)
@@ -502,6 +590,10 @@ class Gameplay(Window):
         if isinstance(box, (list, tuple)):
             box = navy.get_box(*box)
         hitted = navy.box_hit(box)
+        if hitted is not None:
+            self.handle_hit(navy, hitted)
+
+    def handle_hit(self, navy: Navy, hitted: bool):
         if navy.destroyed():
             return
         turn = hitted if navy == self.opposite_grid else not hitted
@@ -511,8 +603,10 @@ class Gameplay(Window):
         self.after(wait_time, lambda: self.set_turn(turn))
 
     def set_turn(self, turn: bool):
+        if self.reconnecting:
+            return
         self.turn_checker.turn = turn
-        if self.turn_checker.turn is True:
+        if self.turn_checker.turn is True and not self.client_socket.peer_suspended:
             self.opposite_grid.set_box_clickable(True)
         if self.turn_checker.turn is False and not self.client_socket.connected() and not self.player_grid.destroyed():
             self.after(1000, lambda: self.hit_a_box(self.player_grid, self.ai.play(self.player_grid.map)))
\ No newline at end of file
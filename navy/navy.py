@@ -5,7 +5,7 @@ import select
 import pygame
 from typing import Type, Union
 from my_pygame import Window, RectangleShape, Image, Button, DrawableListVertical, ButtonListVertical, Scale, Text, CountDown, Entry
-from my_pygame import Dialog
+from my_pygame import Dialog, ServerSocket
 from my_pygame import BLACK, GREEN, GREEN_DARK, GREEN_LIGHT, YELLOW, TRANSPARENT
 from .constants import RESOURCES
 from .navy_setup import NavySetup
@@ -54,6 +54,7 @@ class PlayerServer(Dialog):
     def on_dialog_start_loop(self):
         try:
             ip, port = self.create_server(12800, 1)
+            self.client_socket.join_room(ServerSocket.ANY_ROOM)
             self.text_ip_address.message = f"IP address: {ip}"
             self.text_port_of_connection.message = f"Port: {port}"
         except OSError:
@@ -125,7 +126,8 @@ class PlayerClient(Dialog):
         self.text_connection.show()
         self.text_connection.message = "Connection..."
         self.draw_and_refresh()
-        if not self.connect_to_server(self.ip.get(), int(self.port.get()), 3):
+        if not self.connect_to_server(self.ip.get(), int(self.port.get()), 3) or self.client_socket.join_room(ServerSocket.ANY_ROOM) is None:
+            self.stop_connection()
             self.text_connection.message = "Connection failed. Try again."
         else:
             self.text_connection.hide()
@@ -189,6 +191,7 @@ class NavyWindow(Window):
         self.set_icon(RESOURCES.IMG["icon"])
         self.set_title(f"Navy - v{__version__}")
         self.set_fps(60)
+        self.enable_adaptive_pacing()
         self.disable_key_joy_focus_for_all_window()
 
         self.bg = Image(RESOURCES.IMG["menu_bg"], self.size)
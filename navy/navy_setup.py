@@ -12,6 +12,7 @@ from my_pygame import GREEN, GREEN_DARK, GREEN_LIGHT, WHITE, YELLOW, RED, TRANSP
 from my_pygame import CountDown
 from my_pygame.vector import Vector2
 from .constants import RESOURCES, NB_LINES_BOXES, NB_COLUMNS_BOXES, BOX_SIZE, SHIPS
+from .board import Board
 from .game import Gameplay
 
 class BoxSetup(Button):
@@ -81,8 +82,10 @@ class ShipSetup(Image):
         self.__boxes_covered = boxes
         for box in self.__boxes_covered:
             box.ship = self
+        self.master.add_ship_on_grid(self)
 
     def clear(self) -> None:
+        self.master.remove_ship_from_grid(self)
         for box in self.boxes_covered:
             box.ship = None
         self.boxes_covered.clear()
@@ -172,14 +175,13 @@ class WaitEnemy(Window):
         self.bg = RectangleShape(self.width, self.height, (0, 0, 0, 170))
         self.frame = RectangleShape(0.5 * self.width, 0.5 * self.height, GREEN_DARK, outline=2)
         self.text = Text("Waiting for enemy", font=(None, 70))
+        self.bind_message("ready", lambda data: self.stop())
+        self.bind_message("quit", self.on_enemy_quit)
 
-    def update(self):
-        if self.master.client_socket.recv("ready"):
-            self.stop()
-        elif self.master.client_socket.recv("quit"):
-            self.stop()
-            EnemyQuitGame(self.master).mainloop()
-            self.master.stop()
+    def on_enemy_quit(self, data):
+        self.stop()
+        EnemyQuitGame(self.master).mainloop()
+        self.master.stop()
 
     def place_objects(self):
         self.frame.center = self.center
@@ -199,10 +201,14 @@ class NavySetup(Window):
         }
         self.button_back = ImageButton(self, RESOURCES.IMG["arrow_blue"], **params_for_all_buttons, rotate=180, size=50, callback=self.stop)
         self.navy_grid = DrawableListVertical(offset=0, bg_color=(0, 157, 255))
+        self.__box_grid = list()
+        self.board = Board()
+        self.__board_ships = dict()
         for i in range(NB_LINES_BOXES):
             box_line = DrawableListHorizontal(offset=0)
             for j in range(NB_COLUMNS_BOXES):
                 box_line.add(BoxSetup(self, size=BOX_SIZE, pos=(i, j)))
+            self.__box_grid.append(box_line.list)
             self.navy_grid.add(box_line)
         self.ships_list = DrawableListVertical(offset=70, justify="left")
         for ship_name, ship_infos in SHIPS.items():
@@ -214,6 +220,8 @@ class NavySetup(Window):
         self.button_restart = Button.withImageOnly(self, Image(RESOURCES.IMG["reload_blue"], size=option_size), callback=self.reinit_all_ships, **params_for_all_buttons)
         self.button_random = Button.withImageOnly(self, Image(RESOURCES.IMG["random"], size=option_size), callback=self.shuffle, **params_for_all_buttons)
         self.button_play = Button(self, "Play", font=(None, 40), callback=self.play, **params_for_all_buttons)
+        self.bind_message("quit", self.on_enemy_quit)
+        self.enable_dirty_rects()
 
     @property
     def ships(self) -> Sequence[ShipSetup]:
@@ -242,10 +250,11 @@ class NavySetup(Window):
 
     def update(self):
         self.button_play.state = Button.NORMAL if all(ship.on_map for ship in self.ships) else Button.DISABLED
-        if self.client_socket.recv("quit"):
-            self.count_down.stop()
-            EnemyQuitGame(self).mainloop()
-            self.stop()
+
+    def on_enemy_quit(self, data):
+        self.count_down.stop()
+        EnemyQuitGame(self).mainloop()
+        self.stop()
 
     def create_setup(self) -> Sequence[Dict[str, Dict[str, Any]]]:
         setup = list()
@@ -290,7 +299,19 @@ class NavySetup(Window):
             ship.clear()
 
     def get_box(self, line: int, column: float) -> BoxSetup:
-        return {box.pos: box for box in self.boxes}.get((line, column))
+        if 0 <= line < NB_LINES_BOXES and 0 <= column < NB_COLUMNS_BOXES:
+            return self.__box_grid[line][column]
+        return None
+
+    def add_ship_on_grid(self, ship: ShipSetup) -> None:
+        self.remove_ship_from_grid(ship)
+        if ship.on_map:
+            self.__board_ships[ship] = self.board.add_ship(ship.name, [box.pos for box in ship.boxes_covered], ship.orient)
+
+    def remove_ship_from_grid(self, ship: ShipSetup) -> None:
+        board_ship = self.__board_ships.pop(ship, None)
+        if board_ship is not None:
+            self.board.remove_ship(board_ship)
 
     def remove_boxes_highlight(self):
         for box in self.boxes:
@@ -306,7 +327,7 @@ class NavySetup(Window):
             self.highlight_one_box(ship, box, len(boxes))
             if box.hover is True:
                 boxes.append(box)
-        if len(boxes) != ship.ship_size or any(not self.valid_box(ship, box) for box in boxes):
+        if len(boxes) != ship.ship_size or not self.board.valid_placement([box.pos for box in boxes], ignore=self.__board_ships.get(ship)):
             for box in boxes:
                 box.state = Button.DISABLED
 
@@ -327,27 +348,6 @@ class NavySetup(Window):
                 return
         box.hover = True
 
-    def valid_box(self, ship: ShipSetup, box: BoxSetup) -> bool:
-        line, column = box.pos
-        offsets = [
-            (-1, -1),
-            (0, -1),
-            (1, -1),
-            (-1, 0),
-            (0, 0),
-            (1, 0),
-            (-1, 1),
-            (0, 1),
-            (1, 1)
-        ]
-        for u, v in offsets:
-            box = self.get_box(line + u, column + v)
-            if box is None:
-                continue
-            if box.ship is not None and box.ship != ship:
-                return False
-        return True
-
     def shuffle(self) -> None:
         self.reinit_all_ships()
         for ship in self.ships:
@@ -364,19 +364,5 @@ class NavySetup(Window):
         ship.place_ship_on_map(boxes)
 
     def get_available_boxes(self, ship: ShipSetup):
-        available_boxes = list()
-        for box in self.boxes:
-            if not self.valid_box(ship, box):
-                continue
-            line, column = box.pos
-            valid = True
-            for i in range(1, ship.ship_size):
-                u = line + i if ship.orient == ShipSetup.VERTICAL else line
-                v = column + i if ship.orient == ShipSetup.HORIZONTAL else column
-                b = self.get_box(u, v)
-                if b is None or (not self.valid_box(ship, b)):
-                    valid = False
-                    break
-            if valid:
-                available_boxes.append(box)
-        return available_boxes
\ No newline at end of file
+        available_positions = self.board.get_available_positions(ship.ship_size, ship.orient, ignore=self.__board_ships.get(ship))
+        return [self.get_box(*box_pos) for box_pos in available_positions]
\ No newline at end of file
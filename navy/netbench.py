@@ -0,0 +1,117 @@
+# -*- coding: Utf-8 -*
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import contextlib
+import multiprocessing
+from typing import Any, Dict, List, Optional, Sequence
+from my_pygame.multiplayer import ServerSocket, ClientSocket
+from my_pygame.protocol import MESSAGE_CODEC
+from my_pygame.loadtest import run_in_threads
+from .protocol import register_messages
+
+register_messages(MESSAGE_CODEC)
+
+def run_server(port: int, nb_pairs: int, ready, stop, results) -> None:
+    server = ServerSocket(max_rooms=nb_pairs)
+    server.bind(port, 128)
+    cpu_start = time.process_time()
+    ready.set()
+    stop.wait()
+    stats = server.get_total_stats()
+    results.put({
+        "cpu_time": time.process_time() - cpu_start,
+        "bytes_received": stats.bytes_received,
+        "bytes_sent": stats.bytes_sent
+    })
+    server.stop()
+
+def receive(player: ClientSocket, msg: str, timeout: float) -> Any:
+    if player.wait_for(msg, timeout=timeout) != msg:
+        raise ConnectionError(f"{msg!r} not received")
+    return player.get(msg)
+
+def play_pair(host: str, port: int, nb_attacks: int, timeout: float, round_trips: List[float]) -> int:
+    players = [ClientSocket(batch_send=True, tcp_nodelay=True), ClientSocket(batch_send=True, tcp_nodelay=True)]
+    nb_messages = 0
+    try:
+        for player in players:
+            if not player.connect(host, port, timeout):
+                raise ConnectionError("Cannot connect to the relay server")
+        code = players[0].create_room(timeout=timeout)
+        if code is None or players[1].join_room(code, timeout=timeout) is None:
+            raise ConnectionError("Cannot join a room")
+        for player, peer in [(players[0], players[1]), (players[1], players[0])]:
+            player.send("ready")
+            player.flush()
+            receive(peer, "ready", timeout)
+        players[0].send("turn", False)
+        players[0].flush()
+        receive(players[1], "turn", timeout)
+        nb_messages += 3
+        for i in range(nb_attacks):
+            attacker, defender = players[i % 2], players[(i + 1) % 2]
+            start = time.perf_counter()
+            attacker.send("attack", (random.randrange(10), random.randrange(10)))
+            attacker.flush()
+            receive(defender, "attack", timeout)
+            defender.send("attack_result", {"hit": random.random() < 0.2, "ship_destroyed": None})
+            defender.flush()
+            receive(attacker, "attack_result", timeout)
+            round_trips.append(time.perf_counter() - start)
+            nb_messages += 2
+        return nb_messages
+    finally:
+        for player in players:
+            player.stop()
+
+def benchmark(nb_pairs=100, nb_attacks=50, port=12900, timeout=10) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    ready, stop, server_results = context.Event(), context.Event(), context.Queue()
+    server = context.Process(target=run_server, args=(port, nb_pairs, ready, stop, server_results), daemon=True)
+    server.start()
+    try:
+        if not ready.wait(10):
+            raise OSError("The relay server did not start")
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            report = run_in_threads(play_pair, nb_pairs, "localhost", port, nb_attacks, timeout)
+        report["failed_pairs"] = report.pop("failed")
+        stop.set()
+        server_report = server_results.get(timeout=10)
+    finally:
+        stop.set()
+        server.join(10)
+    report["server"] = server_report
+    report["server"]["cpu_percent"] = 100 * server_report["cpu_time"] / report["elapsed"] if report["elapsed"] > 0 else 0
+    report["parameters"] = {"pairs": nb_pairs, "attacks_per_pair": nb_attacks}
+    report["environment"] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform()
+    }
+    return report
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m navy.netbench", description="Benchmark the relay server with simulated game traffic on localhost")
+    parser.add_argument("-n", "--pairs", type=int, default=100, help="Number of simultaneous client pairs")
+    parser.add_argument("-a", "--attacks", type=int, default=50, help="Attacks exchanged by each pair")
+    parser.add_argument("-p", "--port", type=int, default=12900, help="Port of the local relay server")
+    parser.add_argument("-o", "--output", default=None, help="Save the results to this JSON file")
+    args = parser.parse_args(argv)
+    report = benchmark(args.pairs, args.attacks, args.port)
+    print(f"Pairs: {args.pairs} ({report['failed_pairs']} failed), {report['messages']} messages in {report['elapsed']:.2f}s ({report['messages_per_second']:.0f} msg/s)")
+    print("Attack round trip: p50 {p50:.3f}ms, p90 {p90:.3f}ms, p99 {p99:.3f}ms, max {max:.3f}ms".format(**report["round_trip_ms"]))
+    print(f"Server CPU: {report['server']['cpu_time']:.2f}s ({report['server']['cpu_percent']:.1f}%)")
+    print(f"Server traffic: {report['server']['bytes_received']} bytes received, {report['server']['bytes_sent']} bytes sent")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+    return 0 if report["failed_pairs"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# -*- coding: Utf-8 -*
+
+import sys
+import struct
+import pickle
+import timeit
+from typing import Sequence, Dict, Any, Tuple, List, Optional
+from my_pygame.protocol import MessageCodec, MESSAGE_CODEC
+
+BOOL = struct.Struct(">?")
+BOX = struct.Struct(">BB")
+COUNT = struct.Struct(">B")
+
+ORIENTS = ["horizontal", "vertical"]
+
+def encode_box(box_pos: Sequence[int]) -> bytes:
+    return BOX.pack(*box_pos)
+
+def decode_box(body: bytes) -> Tuple[int, int]:
+    return BOX.unpack(body)
+
+def encode_bool(value: bool) -> bytes:
+    return BOOL.pack(bool(value))
+
+def decode_bool(body: bytes) -> bool:
+    return BOOL.unpack(body)[0]
+
+def encode_ship(ship_infos: Dict[str, Any]) -> bytes:
+    name = ship_infos["name"].encode("utf-8")
+    boxes = ship_infos["boxes"]
+    data = bytearray()
+    data += COUNT.pack(len(name)) + name
+    data += COUNT.pack(ORIENTS.index(ship_infos["orient"]))
+    data += COUNT.pack(len(boxes))
+    for box_pos in boxes:
+        data += BOX.pack(*box_pos)
+    return bytes(data)
+
+def decode_ship(body: bytes, offset=0) -> Tuple[Dict[str, Any], int]:
+    name_size = body[offset]
+    offset += COUNT.size
+    name = bytes(body[offset:offset + name_size]).decode("utf-8")
+    offset += name_size
+    orient = ORIENTS[body[offset]]
+    nb_boxes = body[offset + 1]
+    offset += 2 * COUNT.size
+    boxes = list()
+    for _ in range(nb_boxes):
+        boxes.append(BOX.unpack_from(body, offset))
+        offset += BOX.size
+    return ({"name": name, "boxes": boxes, "orient": orient}, offset)
+
+def encode_ships(ships: Sequence[Dict[str, Any]]) -> bytes:
+    return COUNT.pack(len(ships)) + b"".join(encode_ship(ship_infos) for ship_infos in ships)
+
+def decode_ships(body: bytes) -> List[Dict[str, Any]]:
+    ships = list()
+    offset = COUNT.size
+    for _ in range(body[0]):
+        ship_infos, offset = decode_ship(body, offset)
+        ships.append(ship_infos)
+    return ships
+
+def encode_attack_result(attack_result: Dict[str, Any]) -> bytes:
+    data = BOOL.pack(bool(attack_result["hit"]))
+    if attack_result["ship_destroyed"] is not None:
+        data += encode_ship(attack_result["ship_destroyed"])
+    return data
+
+def decode_attack_result(body: bytes) -> Dict[str, Any]:
+    ship_destroyed = decode_ship(body, BOOL.size)[0] if len(body) > BOOL.size else None
+    return {"hit": BOOL.unpack_from(body)[0], "ship_destroyed": ship_destroyed}
+
+def register_messages(codec: MessageCodec) -> None:
+    codec.register("attack", 16, encode_box, decode_box)
+    codec.register("attack_result", 17, encode_attack_result, decode_attack_result)
+    codec.register("turn", 18, encode_bool, decode_bool, checkpoint=True)
+    codec.register("ready", 19)
+    codec.register("non_destroyed_ships", 20, encode_ships, decode_ships)
+    codec.register("restart", 21)
+
+BENCHMARK_MESSAGES = [
+    ("attack", (4, 7)),
+    ("attack_result", {"hit": False, "ship_destroyed": None}),
+    ("attack_result", {"hit": True, "ship_destroyed": {"name": "carrier", "boxes": [(2, 3), (3, 3), (4, 3), (5, 3)], "orient": "vertical"}}),
+    ("turn", True),
+    ("ready", None),
+    ("non_destroyed_ships", [
+        {"name": "battleship", "boxes": [(0, 0), (0, 1), (0, 2)], "orient": "horizontal"},
+        {"name": "destroyer", "boxes": [(9, 8), (9, 9)], "orient": "horizontal"},
+        {"name": "patroal_boat", "boxes": [(5, 5)], "orient": "horizontal"}
+    ]),
+    ("restart", None),
+    ("quit", None)
+]
+
+def benchmark(number=10000, codec: Optional[MessageCodec] = None) -> List[Dict[str, Any]]:
+    codec = codec if codec is not None else MESSAGE_CODEC
+    register_messages(codec)
+    results = list()
+    for msg, data in BENCHMARK_MESSAGES:
+        pickled = pickle.dumps({msg: data})
+        encoded = codec.encode(msg, data)
+        pickle_time = timeit.timeit(lambda: pickle.loads(pickle.dumps({msg: data})), number=number)
+        codec_time = timeit.timeit(lambda: codec.decode(codec.encode(msg, data)), number=number)
+        results.append({
+            "message": msg,
+            "pickle_size": len(pickled),
+            "codec_size": len(encoded),
+            "pickle_per_second": number / pickle_time,
+            "codec_per_second": number / codec_time
+        })
+    return results
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    number = int(argv[0]) if argv else 10000
+    print(f"{'message':<22}{'pickle B':>10}{'codec B':>10}{'pickle msg/s':>15}{'codec msg/s':>15}")
+    for result in benchmark(number):
+        print("{message:<22}{pickle_size:>10}{codec_size:>10}{pickle_per_second:>15.0f}{codec_per_second:>15.0f}".format(**result))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
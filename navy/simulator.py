@@ -0,0 +1,95 @@
+# -*- coding: Utf-8 -*
+
+import sys
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence, Dict, Any, Tuple, List, Optional
+from my_pygame.stats import percentile
+from .board import Board
+from .ai import AI, ProbabilityAI
+
+AI_STRATEGIES = {
+    "random": AI,
+    "probability": ProbabilityAI
+}
+
+def play_game(ai_name: str, seed: Optional[int] = None) -> Tuple[int, List[float]]:
+    if seed is not None:
+        random.seed(seed)
+    board = Board()
+    board.shuffle()
+    ai = AI_STRATEGIES[ai_name]()
+    ai.reset()
+    latencies = list()
+    nb_shots = 0
+    while not board.destroyed():
+        start = time.perf_counter()
+        line, column = ai.play(board.map)
+        latencies.append(time.perf_counter() - start)
+        nb_shots += 1
+        hit, ship_destroyed = board.shoot(line, column)
+        if ship_destroyed is not None:
+            for box_pos in board.get_boxes_around(ship_destroyed):
+                board.mark(*box_pos)
+    return nb_shots, latencies
+
+def play_games(ai_name: str, seeds: Sequence[Optional[int]]) -> List[Tuple[int, List[float]]]:
+    return [play_game(ai_name, seed) for seed in seeds]
+
+def simulate(nb_games: int, ai_name="probability", workers=None, seed=None, chunk_size=50) -> Dict[str, Any]:
+    if ai_name not in AI_STRATEGIES:
+        raise ValueError(f"Unknown AI strategy {ai_name!r}")
+    if seed is None:
+        seeds = [None] * nb_games
+    else:
+        seeds = [seed + i for i in range(nb_games)]
+    chunks = [seeds[i:i + chunk_size] for i in range(0, nb_games, chunk_size)]
+    shots = list()
+    latencies = list()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(play_games, [ai_name] * len(chunks), chunks):
+            for nb_shots, game_latencies in results:
+                shots.append(nb_shots)
+                latencies.extend(game_latencies)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "ai": ai_name,
+        "games": nb_games,
+        "elapsed": elapsed,
+        "games_per_second": nb_games / elapsed if elapsed > 0 else 0,
+        "average_shots": sum(shots) / len(shots) if shots else 0,
+        "min_shots": min(shots, default=0),
+        "max_shots": max(shots, default=0),
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p90": percentile(latencies, 90) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else 0
+        }
+    }
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"AI: {report['ai']}")
+    print(f"Games: {report['games']} in {report['elapsed']:.2f}s ({report['games_per_second']:.1f} games/s)")
+    print(f"Shots to win: {report['average_shots']:.2f} avg (min {report['min_shots']}, max {report['max_shots']})")
+    latency = report["latency_ms"]
+    print("Move latency: p50 {p50:.3f}ms, p90 {p90:.3f}ms, p99 {p99:.3f}ms, max {max:.3f}ms".format(**latency))
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m navy.simulator", description="Play headless AI games and benchmark the AI strategies")
+    parser.add_argument("-n", "--games", type=int, default=1000, help="Number of games per strategy")
+    parser.add_argument("-a", "--ai", choices=list(AI_STRATEGIES) + ["all"], default="all", help="AI strategy to benchmark")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Base seed to make the setups reproducible")
+    args = parser.parse_args(argv)
+    ai_names = list(AI_STRATEGIES) if args.ai == "all" else [args.ai]
+    for ai_name in ai_names:
+        print_report(simulate(args.games, ai_name, workers=args.workers, seed=args.seed))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
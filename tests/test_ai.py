@@ -0,0 +1,56 @@
+# -*- coding: Utf-8 -*
+
+import os
+import sys
+import random
+import unittest
+import importlib.util
+
+# navy resolves its resources folder from sys.path[0]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if importlib.util.find_spec("pygame") is not None:
+    from navy.ai import ProbabilityAI
+    from navy.board import Board
+    from navy.simulator import play_game
+
+@unittest.skipIf(importlib.util.find_spec("pygame") is None, "pygame is not installed")
+class ProbabilityAITest(unittest.TestCase):
+
+    def test_finishes_a_partially_hit_ship(self):
+        for seed in range(10):
+            random.seed(seed)
+            board = Board()
+            carrier = board.add_ship("carrier", [(5, 3), (5, 4), (5, 5), (5, 6)], Board.HORIZONTAL)
+            board.shoot(5, 4)
+            ai = ProbabilityAI()
+            ai.reset()
+            nb_shots = 0
+            while not board.ship_destroyed(carrier):
+                line, column = ai.play(board.map)
+                self.assertTrue(line == 5 or column == 4, (seed, line, column))
+                self.assertFalse(board.is_shot(line, column))
+                board.shoot(line, column)
+                nb_shots += 1
+            self.assertLessEqual(nb_shots, 6)
+
+    def test_never_shoots_next_to_a_sunk_ship(self):
+        board = Board()
+        destroyer = board.add_ship("destroyer", [(0, 0), (0, 1)], Board.HORIZONTAL)
+        board.shoot(0, 0)
+        board.shoot(0, 1)
+        self.assertTrue(board.ship_destroyed(destroyer))
+        ai = ProbabilityAI()
+        ai.reset()
+        around = set(board.get_boxes_around(destroyer))
+        for seed in range(10):
+            random.seed(seed)
+            self.assertNotIn(ai.play(board.map), around)
+
+    def test_wins_a_game(self):
+        nb_shots, latencies = play_game("probability", seed=2020)
+        self.assertLessEqual(nb_shots, 100)
+        self.assertEqual(len(latencies), nb_shots)
+
+if __name__ == "__main__":
+    unittest.main()
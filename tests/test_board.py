@@ -0,0 +1,169 @@
+# -*- coding: Utf-8 -*
+
+import os
+import sys
+import random
+import unittest
+import importlib.util
+
+# navy resolves its resources folder from sys.path[0]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if importlib.util.find_spec("pygame") is not None:
+    from navy.board import Board
+    from navy.constants import SHIPS, NB_SHIPS
+
+class ListBoard:
+
+    # List-based placement and hit rules the navy grids used before the bitboard engine
+
+    def __init__(self, nb_lines: int, nb_columns: int):
+        self.nb_lines = nb_lines
+        self.nb_columns = nb_columns
+        self.ships = list()
+        self.shots = set()
+
+    def get_ship(self, line: int, column: int):
+        for ship in self.ships:
+            if (line, column) in ship:
+                return ship
+        return None
+
+    def valid_box(self, line: int, column: int, ignore=None) -> bool:
+        for u in (-1, 0, 1):
+            for v in (-1, 0, 1):
+                ship = self.get_ship(line + u, column + v)
+                if ship is not None and ship is not ignore:
+                    return False
+        return True
+
+    def get_available_positions(self, size: int, orient: str, ignore=None):
+        available_positions = list()
+        for line in range(self.nb_lines):
+            for column in range(self.nb_columns):
+                valid = True
+                for i in range(size):
+                    u = line + i if orient == Board.VERTICAL else line
+                    v = column + i if orient == Board.HORIZONTAL else column
+                    if not (0 <= u < self.nb_lines and 0 <= v < self.nb_columns) or not self.valid_box(u, v, ignore):
+                        valid = False
+                        break
+                if valid:
+                    available_positions.append((line, column))
+        return available_positions
+
+    def ship_destroyed(self, ship) -> bool:
+        return all(box_pos in self.shots for box_pos in ship)
+
+    def get_state(self, line: int, column: int) -> int:
+        if (line, column) not in self.shots:
+            return Board.NO_HIT
+        ship = self.get_ship(line, column)
+        if ship is None:
+            return Board.HATCH
+        return Board.SHIP_DESTROYED if self.ship_destroyed(ship) else Board.CROSS
+
+@unittest.skipIf(importlib.util.find_spec("pygame") is None, "pygame is not installed")
+class BoardTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(2020)
+        self.board = Board()
+
+    def test_add_and_remove_ship(self):
+        ship = self.board.add_ship("destroyer", [(2, 2), (2, 3), (2, 4)], Board.HORIZONTAL)
+        self.assertIs(self.board.get_ship(2, 3), ship)
+        self.assertIsNone(self.board.get_ship(3, 3))
+        self.assertFalse(self.board.valid_placement([(2, 3), (3, 3)]))
+        self.assertTrue(self.board.valid_placement([(2, 3), (3, 3)], ignore=ship))
+        self.board.remove_ship(ship)
+        self.assertIsNone(self.board.get_ship(2, 3))
+        self.assertEqual(self.board.ships, ())
+        self.assertTrue(self.board.valid_placement([(2, 3), (3, 3)]))
+
+    def test_adjacent_cells_are_blocked(self):
+        self.board.add_ship("patroal_boat", [(4, 4), (4, 5)], Board.HORIZONTAL)
+        for line in range(3, 6):
+            for column in range(3, 7):
+                self.assertFalse(self.board.is_free(line, column), (line, column))
+        self.assertTrue(self.board.is_free(2, 4))
+        self.assertTrue(self.board.is_free(4, 7))
+        self.assertFalse(self.board.valid_placement([(5, 6), (6, 6)]))
+        self.assertTrue(self.board.valid_placement([(6, 6), (7, 6)]))
+
+    def test_ship_outside_the_board(self):
+        self.assertFalse(self.board.valid_placement([(9, 9), (9, 10)]))
+        self.assertIsNone(self.board.get_ship_boxes(9, 8, 3, Board.HORIZONTAL))
+        with self.assertRaises(ValueError):
+            self.board.add_ship("patroal_boat", [(9, 9), (10, 9)], Board.VERTICAL)
+
+    def test_shoot_and_mark(self):
+        ship = self.board.add_ship("patroal_boat", [(0, 0), (1, 0)], Board.VERTICAL)
+        self.assertEqual(self.board.shoot(5, 5), (False, None))
+        self.assertEqual(self.board.get_state(5, 5), Board.HATCH)
+        self.assertEqual(self.board.shoot(0, 0), (True, None))
+        self.assertEqual(self.board.get_state(0, 0), Board.CROSS)
+        self.assertFalse(self.board.ship_destroyed(ship))
+        self.assertEqual(self.board.shoot(1, 0), (True, ship))
+        self.assertTrue(self.board.ship_destroyed(ship))
+        self.assertEqual(self.board.get_state(0, 0), Board.SHIP_DESTROYED)
+        self.assertEqual(self.board.shoot(1, 0), (True, None))
+        self.assertEqual(self.board.nb_destroyed_ships, 1)
+        self.assertEqual(sorted(self.board.get_boxes_around(ship)), [(0, 1), (1, 1), (2, 0), (2, 1)])
+        self.board.mark(2, 0)
+        self.assertEqual(self.board.get_state(2, 0), Board.HATCH)
+        self.assertNotIn((2, 0), self.board.get_boxes_around(ship))
+
+    def test_marked_ship_is_destroyed_when_added(self):
+        self.board.mark(3, 3)
+        self.board.mark(3, 4)
+        ship = self.board.add_ship("patroal_boat", [(3, 3), (3, 4)], Board.HORIZONTAL)
+        self.assertTrue(self.board.ship_destroyed(ship))
+        self.assertEqual(self.board.nb_destroyed_ships, 1)
+
+    def test_available_positions_match_the_list_rules(self):
+        for _ in range(20):
+            board = Board()
+            reference = ListBoard(board.nb_lines, board.nb_columns)
+            board_ships = list()
+            for ship_infos in SHIPS.values():
+                for _ in range(ship_infos["nb"]):
+                    orient = random.choice([Board.HORIZONTAL, Board.VERTICAL])
+                    positions = board.get_available_positions(ship_infos["size"], orient)
+                    self.assertEqual(positions, reference.get_available_positions(ship_infos["size"], orient))
+                    if not positions:
+                        continue
+                    boxes = board.get_ship_boxes(*random.choice(positions), ship_infos["size"], orient)
+                    board_ships.append(board.add_ship("ship", boxes, orient))
+                    reference.ships.append(boxes)
+            for board_ship, boxes in zip(board_ships, reference.ships):
+                for orient in (Board.HORIZONTAL, Board.VERTICAL):
+                    self.assertEqual(board.get_available_positions(3, orient, ignore=board_ship), reference.get_available_positions(3, orient, ignore=boxes))
+
+    def test_shots_match_the_list_rules(self):
+        self.board.shuffle()
+        reference = ListBoard(self.board.nb_lines, self.board.nb_columns)
+        reference.ships = [ship.boxes for ship in self.board.ships]
+        cells = [(line, column) for line in range(self.board.nb_lines) for column in range(self.board.nb_columns)]
+        random.shuffle(cells)
+        for line, column in cells:
+            hit, ship_destroyed = self.board.shoot(line, column)
+            ship = reference.get_ship(line, column)
+            reference.shots.add((line, column))
+            self.assertEqual(hit, ship is not None)
+            self.assertEqual(ship_destroyed is not None, ship is not None and reference.ship_destroyed(ship))
+            self.assertEqual(self.board.map, {(u, v): reference.get_state(u, v) for u, v in cells})
+        self.assertTrue(self.board.destroyed())
+
+    def test_shuffle(self):
+        for _ in range(20):
+            self.board.shuffle()
+            self.assertEqual(len(self.board.ships), NB_SHIPS)
+            reference = ListBoard(self.board.nb_lines, self.board.nb_columns)
+            for ship in self.board.ships:
+                self.assertTrue(all(reference.valid_box(*box_pos) for box_pos in ship.boxes))
+                reference.ships.append(ship.boxes)
+            self.assertFalse(self.board.destroyed())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+# -*- coding: Utf-8 -*
+
+import os
+import sys
+import socket
+import time
+import struct
+import unittest
+import threading
+import importlib.util
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if importlib.util.find_spec("pygame") is not None:
+    from my_pygame.multiplayer import FrameReader, ServerSocket, ClientSocket
+    from my_pygame.protocol import PEER_SUSPENDED_MESSAGE, PEER_RESUMED_MESSAGE
+
+CONNECTED_CLIENT_SCRIPT = """
+from my_pygame.multiplayer import ServerSocket, ClientSocket
+server = ServerSocket()
+server.bind({port}, 1)
+client = ClientSocket()
+assert client.connect("localhost", {port}, 3)
+"""
+
+def frame(payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + payload
+
+def wait_until(predicate, timeout=3) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+@unittest.skipIf(importlib.util.find_spec("pygame") is None, "pygame is not installed")
+class ClientSocketTest(unittest.TestCase):
+
+    def test_connected_client_does_not_block_exit(self):
+        script = CONNECTED_CLIENT_SCRIPT.format(port=get_free_port())
+        try:
+            process = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, timeout=15)
+        except subprocess.TimeoutExpired:
+            self.fail("The interpreter did not exit while a ClientSocket was connected")
+        self.assertEqual(process.returncode, 0, process.stderr.decode(errors="replace"))
+
+    def test_flush_while_the_connection_closes(self):
+        port = get_free_port()
+        server = ServerSocket()
+        server.bind(port, 1)
+        client = ClientSocket(batch_send=True)
+        try:
+            self.assertTrue(client.connect("localhost", port, 3))
+            threading.Timer(0.2, server.stop).start()
+            deadline = time.monotonic() + 5
+            while client.connected() and time.monotonic() < deadline:
+                client.send("move", (1, 2))
+                client.flush()
+            self.assertFalse(client.connected())
+            client.flush()
+        finally:
+            client.stop()
+            server.stop()
+
+@unittest.skipIf(importlib.util.find_spec("pygame") is None, "pygame is not installed")
+class SessionResumeTest(unittest.TestCase):
+
+    GRACE_PERIOD = 1
+
+    def setUp(self):
+        port = get_free_port()
+        self.server = ServerSocket(grace_period=SessionResumeTest.GRACE_PERIOD)
+        self.server.bind(port, 2)
+        self.survivor = ClientSocket()
+        self.dropped = ClientSocket()
+        self.assertTrue(self.survivor.connect("localhost", port, 3))
+        self.assertTrue(self.dropped.connect("localhost", port, 3))
+        code = self.survivor.create_room()
+        self.assertEqual(self.dropped.join_room(code), code)
+        self.assertTrue(wait_until(lambda: self.survivor.session is not None and self.dropped.session is not None))
+        self.dropped.send("start", True)
+        self.assertEqual(self.survivor.wait_for("start"), "start")
+        self.assertTrue(self.survivor.get("start"))
+
+    def tearDown(self):
+        self.survivor.stop()
+        self.dropped.stop()
+        self.server.stop()
+
+    def drop_connection(self):
+        getattr(self.dropped, "_ClientSocket__socket").shutdown(socket.SHUT_RDWR)
+        self.assertTrue(wait_until(lambda: self.dropped.connection_lost and not self.dropped.connected()))
+        self.assertEqual(self.survivor.wait_for(PEER_SUSPENDED_MESSAGE, timeout=3), PEER_SUSPENDED_MESSAGE)
+        self.assertEqual(self.survivor.get(PEER_SUSPENDED_MESSAGE), SessionResumeTest.GRACE_PERIOD)
+        self.assertTrue(self.survivor.peer_suspended)
+
+    def test_resume_session(self):
+        self.drop_connection()
+        self.survivor.send("move", [4, 7])
+        log = self.dropped.resume_session(timeout=3)
+        self.assertEqual(log, [(True, "start", True), (False, "move", [4, 7])])
+        self.assertEqual(self.survivor.wait_for(PEER_RESUMED_MESSAGE, timeout=3), PEER_RESUMED_MESSAGE)
+        self.assertFalse(self.survivor.peer_suspended)
+        self.dropped.send("move_result", {"hit": False})
+        self.assertEqual(self.survivor.wait_for("move_result"), "move_result")
+
+    def test_wait_lasts_until_the_peer_resumes(self):
+        self.drop_connection()
+        start = time.monotonic()
+        threading.Timer(0.5, lambda: self.dropped.resume_session(timeout=3) is not None and self.dropped.send("move", [1, 2])).start()
+        self.assertEqual(self.survivor.wait_for("move", timeout=0.1), "move")
+        self.assertGreaterEqual(time.monotonic() - start, 0.5)
+
+    def test_grace_period_expiry(self):
+        self.drop_connection()
+        start = time.monotonic()
+        self.assertIsNone(self.survivor.wait_for("move", timeout=0.1))
+        elapsed = time.monotonic() - start
+        self.assertLess(elapsed, SessionResumeTest.GRACE_PERIOD + 1)
+        self.assertTrue(wait_until(lambda: not self.survivor.peer_suspended))
+        self.assertIsNone(self.dropped.resume_session(timeout=3))
+        self.assertIsNone(self.dropped.session)
+        self.assertTrue(self.survivor.connected())
+
+@unittest.skipIf(importlib.util.find_spec("pygame") is None, "pygame is not installed")
+class FrameReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.reader = FrameReader()
+        self.sender, self.receiver = socket.socketpair()
+
+    def tearDown(self):
+        self.sender.close()
+        self.receiver.close()
+
+    def test_header_split_across_reads(self):
+        data = frame(b"navy")
+        self.assertEqual(self.reader.feed(data[:1]), [])
+        self.assertEqual(self.reader.feed(data[1:3]), [])
+        self.assertEqual(self.reader.feed(data[3:]), [b"navy"])
+        self.assertEqual(len(self.reader), 0)
+
+    def test_payload_split_across_reads(self):
+        data = frame(b"battleship")
+        self.assertEqual(self.reader.feed(data[:6]), [])
+        self.assertEqual(len(self.reader), 6)
+        self.assertEqual(self.reader.feed(data[6:]), [b"battleship"])
+        self.assertEqual(len(self.reader), 0)
+
+    def test_several_frames_in_one_read(self):
+        self.sender.sendall(frame(b"a") + frame(b"") + frame(b"bc") + frame(b"def")[:5])
+        self.assertEqual(self.reader.read(self.receiver), [b"a", b"", b"bc"])
+        self.assertEqual(len(self.reader), 5)
+        self.sender.sendall(b"ef" + frame(b"g"))
+        self.assertEqual(self.reader.read(self.receiver), [b"def", b"g"])
+        self.assertEqual(len(self.reader), 0)
+
+    def test_frame_larger_than_the_receive_buffer(self):
+        reader = FrameReader(bufsize=16)
+        payload = bytes(range(40))
+        self.sender.sendall(frame(payload))
+        frames = list()
+        while not frames:
+            frames = reader.read(self.receiver)
+        self.assertEqual(frames, [payload])
+
+    def test_eof_in_the_middle_of_a_frame(self):
+        self.sender.sendall(frame(b"carrier")[:7])
+        self.sender.close()
+        self.assertEqual(self.reader.read(self.receiver), [])
+        self.assertIsNone(self.reader.read(self.receiver))
+        self.assertEqual(len(self.reader), 7)
+        self.reader.clear()
+        self.assertEqual(len(self.reader), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: Utf-8 -*
+
+import os
+import sys
+import unittest
+import importlib.util
+
+# navy resolves its resources folder from sys.path[0]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if importlib.util.find_spec("pygame") is not None:
+    from my_pygame.protocol import MessageCodec, ProtocolError, HEADER, PROTOCOL_VERSION
+    from my_pygame.protocol import PING_MESSAGE, ROOM_JOINED_MESSAGE, SESSION_LOG_MESSAGE, PEER_SUSPENDED_MESSAGE
+    from my_pygame.protocol import encode_timestamp, encode_room, encode_session_log, decode_timestamp, decode_room, decode_session_log
+    from navy.protocol import BENCHMARK_MESSAGES, register_messages
+
+SHIPS = [
+    {"name": "battleship", "boxes": [(0, 0), (0, 1), (0, 2)], "orient": "horizontal"},
+    {"name": "destroyer", "boxes": [(8, 9), (9, 9)], "orient": "vertical"}
+]
+
+@unittest.skipIf(importlib.util.find_spec("pygame") is None, "pygame is not installed")
+class MessageCodecTest(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = MessageCodec()
+        self.codec.register("quit", 2)
+        self.codec.register(ROOM_JOINED_MESSAGE, 4, encode_room, decode_room)
+        self.codec.register(PING_MESSAGE, 6, encode_timestamp, decode_timestamp)
+        self.codec.register(SESSION_LOG_MESSAGE, 10, encode_session_log, decode_session_log)
+        self.codec.register(PEER_SUSPENDED_MESSAGE, 11, encode_timestamp, decode_timestamp)
+        register_messages(self.codec)
+
+    def assertRoundTrip(self, msg, data, expected=None):
+        version, decoded_msg, decoded_data = self.codec.decode(self.codec.encode(msg, data))
+        self.assertEqual(version, PROTOCOL_VERSION)
+        self.assertEqual(decoded_msg, msg)
+        self.assertEqual(decoded_data, data if expected is None else expected)
+
+    def test_navy_messages_round_trip(self):
+        for msg, data in BENCHMARK_MESSAGES:
+            with self.subTest(msg=msg):
+                self.assertRoundTrip(msg, data)
+
+    def test_builtin_messages_round_trip(self):
+        self.assertRoundTrip(PING_MESSAGE, 1234.5)
+        self.assertRoundTrip(PEER_SUSPENDED_MESSAGE, 60.0)
+        self.assertRoundTrip(ROOM_JOINED_MESSAGE, ("ABCDEF", 2))
+        self.assertRoundTrip(SESSION_LOG_MESSAGE, [(True, b"\x01\x10\x04\x07"), (False, b"")])
+
+    def test_unregistered_message_round_trip(self):
+        self.assertRoundTrip("chat", {"text": "hello", "to": [1, 2]})
+        self.assertRoundTrip("empty", None)
+
+    def test_registered_names_keep_their_type_id(self):
+        self.assertEqual(self.codec.encode("attack", (4, 7))[:HEADER.size], HEADER.pack(PROTOCOL_VERSION, 16))
+        self.assertTrue(self.codec.is_checkpoint(self.codec.get_type_id("turn")))
+        self.assertFalse(self.codec.is_checkpoint(self.codec.get_type_id("attack")))
+        with self.assertRaises(ValueError):
+            self.codec.register("other", 16)
+        with self.assertRaises(ValueError):
+            self.codec.register("other", 256)
+
+    def test_truncated_header(self):
+        for payload in (b"", bytes([PROTOCOL_VERSION])):
+            with self.assertRaises(ProtocolError):
+                self.codec.decode(payload)
+
+    def test_unknown_type_id(self):
+        with self.assertRaises(ProtocolError):
+            self.codec.decode(HEADER.pack(PROTOCOL_VERSION, 200))
+
+    def test_bad_version(self):
+        payload = self.codec.encode("attack", (4, 7))
+        for version in (0, PROTOCOL_VERSION + 1):
+            with self.assertRaises(ProtocolError):
+                self.codec.decode(HEADER.pack(version, payload[1]) + payload[HEADER.size:])
+
+    def test_truncated_ship_list(self):
+        payload = self.codec.encode("non_destroyed_ships", SHIPS)
+        for size in range(HEADER.size, len(payload)):
+            with self.subTest(size=size), self.assertRaises(ProtocolError):
+                self.codec.decode(payload[:size])
+
+    def test_truncated_attack_result(self):
+        payload = self.codec.encode("attack_result", {"hit": True, "ship_destroyed": SHIPS[0]})
+        for size in [HEADER.size] + list(range(HEADER.size + 2, len(payload))):
+            with self.subTest(size=size), self.assertRaises(ProtocolError):
+                self.codec.decode(payload[:size])
+
+    def test_malformed_bodies(self):
+        payloads = [
+            self.codec.encode("attack", (4, 7))[:-1],
+            self.codec.encode("turn", True) + b"\x00",
+            HEADER.pack(PROTOCOL_VERSION, self.codec.get_type_id("non_destroyed_ships")) + b"\x01\x01a\x05\x01\x00\x00",
+            self.codec.encode(SESSION_LOG_MESSAGE, [(True, b"\x01\x10\x04\x07")])[:-1],
+            self.codec.encode("chat", "hello")[:-1],
+            HEADER.pack(PROTOCOL_VERSION, self.codec.get_type_id(ROOM_JOINED_MESSAGE)) + b"\x01\xff"
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload), self.assertRaises(ProtocolError):
+                self.codec.decode(payload)
+
+    def test_negotiate(self):
+        codec = MessageCodec(version=3, min_version=2)
+        self.assertEqual(codec.negotiate(5, 1), 3)
+        self.assertEqual(codec.negotiate(2, 1), 2)
+        self.assertIsNone(codec.negotiate(1, 1))
+        self.assertIsNone(codec.negotiate(5, 4))
+        _, msg, versions = codec.decode(codec.hello())
+        self.assertEqual(versions, (3, 2))
+
+if __name__ == "__main__":
+    unittest.main()